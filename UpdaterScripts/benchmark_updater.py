@@ -0,0 +1,733 @@
+#!/usr/bin/env python3
+import argparse
+import hashlib
+import http.server
+import json
+import os
+import platform
+import py_compile
+import re
+import shutil
+import socketserver
+import stat
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import zipfile
+from pathlib import Path
+from typing import Optional
+
+UPDATER = Path(__file__).resolve().with_name("launchnext_updater.py")
+REPO_OWNER = "RoversX"
+REPO_NAME = "LaunchNext"
+DEFAULT_SIZES = "1,10,100,500"
+RANDOM_BLOCK_BYTES = 4 * 1024 * 1024
+RESOURCE_FILE_BYTES = 8 * 1024 * 1024
+SEND_CHUNK_BYTES = 1024 * 1024
+STARTUP_BUDGET_MS = 60.0
+STARTUP_SAMPLES = 7
+DEFERRED_MODULES = (
+    "curses",
+    "textwrap",
+    "tempfile",
+    "urllib.request",
+    "http.client",
+    "zipfile",
+    "concurrent.futures",
+    "subprocess",
+    "hashlib",
+    "gzip",
+)
+DOWNLOAD_LOOP_MB = 256
+DOWNLOAD_LOOP_SAMPLES = 3
+FIXED_CHUNK_BYTES = 512 * 1024
+QUARANTINE_FILES = 20000
+QUARANTINE_SAMPLES = 3
+QUARANTINE_FILES_PER_DIR = 100
+QUARANTINE_ATTRIBUTE = "user.launchnext.quarantine"
+QUARANTINE_VALUE = b"0081;00000000;LaunchNext Benchmark;"
+MB = 1024 * 1024
+GIB = 1024 * MB
+
+DOWNLOAD_LOOP_WORKER = """
+import hashlib
+import importlib.util
+import json
+import resource
+import sys
+import time
+from pathlib import Path
+
+spec = importlib.util.spec_from_file_location("launchnext_updater", sys.argv[1])
+updater = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(updater)
+updater.load_lazy_modules()
+mode, url, dest, size = sys.argv[2], sys.argv[3], Path(sys.argv[4]), int(sys.argv[5])
+readers = []
+
+
+class CountingReader(updater.ChunkReader):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.reads = 0
+        self.allocated = len(self.buffer)
+        readers.append(self)
+
+    def read(self, response, limit=None):
+        buffer = self.buffer
+        chunk = super().read(response, limit)
+        self.reads += 1
+        if self.buffer is not buffer:
+            self.allocated += len(self.buffer)
+        return chunk
+
+
+updater.ChunkReader = CountingReader
+strings = updater.ensure_language(updater.STRINGS, "en")
+before = resource.getrusage(resource.RUSAGE_SELF)
+start = time.perf_counter()
+if mode == "fixed":
+    digest = hashlib.sha256()
+    reads = 0
+    with updater.open_asset(url) as response, open(dest, "wb") as out:
+        while True:
+            chunk = response.read({fixed_chunk})
+            if not chunk:
+                break
+            out.write(chunk)
+            digest.update(chunk)
+            reads += 1
+    received = dest.stat().st_size
+    allocated = received
+else:
+    received = updater.download_stream(
+        url,
+        dest,
+        dest.with_name(dest.name + ".json"),
+        {{}},
+        updater.Logger(None),
+        strings,
+        None,
+        size,
+        updater.IncrementalHasher(),
+    )
+    reads = sum(reader.reads for reader in readers)
+    allocated = sum(reader.allocated for reader in readers)
+wall = time.perf_counter() - start
+after = resource.getrusage(resource.RUSAGE_SELF)
+print(json.dumps({{
+    "bytes": received,
+    "wall_seconds": wall,
+    "cpu_seconds": after.ru_utime + after.ru_stime - before.ru_utime - before.ru_stime,
+    "allocated_bytes": allocated,
+    "reads": reads,
+    "final_chunk_bytes": readers[-1].size if readers else {fixed_chunk},
+}}))
+"""
+
+QUARANTINE_WORKER = """
+import importlib.util
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+spec = importlib.util.spec_from_file_location("launchnext_updater", sys.argv[1])
+updater = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(updater)
+updater.load_lazy_modules()
+root, name, workers = Path(sys.argv[2]), sys.argv[3], int(sys.argv[4])
+tagged = 0
+for directory, dirnames, filenames in os.walk(root):
+    for entry in [directory, *(os.path.join(directory, filename) for filename in filenames)]:
+        updater.set_xattr(entry, name, {value!r})
+        tagged += 1
+start = time.perf_counter()
+report = updater.strip_xattr_tree(root, name, workers or updater.XATTR_WORKERS)
+print(json.dumps({{
+    "seconds": time.perf_counter() - start,
+    "tagged": tagged,
+    "files": report["files"],
+    "removed": report["removed"],
+    "failures": len(report["failures"]),
+    "workers": workers or updater.XATTR_WORKERS,
+}}))
+"""
+
+NOOP_SHIM = """#!/bin/sh
+exit 0
+"""
+
+
+class Release:
+    def __init__(self, tag: str, asset_path: Path, digest: str):
+        self.tag = tag
+        self.asset_path = asset_path
+        self.digest = digest
+
+    def metadata(self, base_url: str) -> dict:
+        size = self.asset_path.stat().st_size
+        return {
+            "tag_name": self.tag,
+            "html_url": f"{base_url}/{REPO_OWNER}/{REPO_NAME}/releases/tag/{self.tag}",
+            "assets": [
+                {
+                    "id": size,
+                    "name": self.asset_path.name,
+                    "size": size,
+                    "updated_at": "2025-01-01T00:00:00Z",
+                    "digest": f"sha256:{self.digest}",
+                    "browser_download_url": f"{base_url}/assets/{self.asset_path.name}",
+                }
+            ],
+        }
+
+
+class ApiServer(socketserver.ThreadingMixIn, http.server.HTTPServer):
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), ApiHandler)
+        self.release: Optional[Release] = None
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.connections = 0
+        self.bytes_sent = 0
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def count(self, sent: int) -> None:
+        with self.lock:
+            self.requests += 1
+            self.bytes_sent += sent
+
+    def connected(self) -> None:
+        with self.lock:
+            self.connections += 1
+
+    def take_counters(self) -> dict:
+        with self.lock:
+            counters = {"connections": self.connections, "requests": self.requests, "bytes_sent": self.bytes_sent}
+            self.connections = 0
+            self.requests = 0
+            self.bytes_sent = 0
+        return counters
+
+
+class ApiHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        self.server.connected()
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        release = self.server.release
+        path = self.path.split("?", 1)[0]
+        prefix = f"/repos/{REPO_OWNER}/{REPO_NAME}/releases/"
+        if release and (path == prefix + "latest" or path == prefix + f"tags/{release.tag}"):
+            self.send_metadata(release)
+        elif release and path == f"/assets/{release.asset_path.name}":
+            self.send_asset(release.asset_path)
+        else:
+            self.send_error(404)
+            self.server.count(0)
+
+    def send_metadata(self, release: Release) -> None:
+        body = json.dumps(release.metadata(self.server.base_url)).encode("utf-8")
+        etag = '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            self.server.count(0)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", etag)
+        self.send_header("X-RateLimit-Limit", "60")
+        self.send_header("X-RateLimit-Remaining", "59")
+        self.send_header("X-RateLimit-Reset", str(int(time.time()) + 3600))
+        self.end_headers()
+        self.wfile.write(body)
+        self.server.count(len(body))
+
+    def send_asset(self, path: Path) -> None:
+        info = path.stat()
+        size = info.st_size
+        etag = f'"{info.st_ino:x}-{size:x}-{int(info.st_mtime):x}"'
+        start, end = 0, size - 1
+        ranged = False
+        match = re.fullmatch(r"bytes=(\d*)-(\d*)", self.headers.get("Range", ""))
+        if match and self.headers.get("If-Range", etag) == etag:
+            first, last = match.groups()
+            if first:
+                start = int(first)
+                end = min(int(last), size - 1) if last else size - 1
+            elif last:
+                start = max(0, size - int(last))
+            ranged = True
+            if start >= size or start > end:
+                self.send_response(416)
+                self.send_header("Content-Range", f"bytes */{size}")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                self.server.count(0)
+                return
+        length = end - start + 1
+        self.send_response(206 if ranged else 200)
+        self.send_header("Content-Type", "application/zip")
+        self.send_header("Content-Length", str(length))
+        self.send_header("Accept-Ranges", "bytes")
+        self.send_header("ETag", etag)
+        if ranged:
+            self.send_header("Content-Range", f"bytes {start}-{end}/{size}")
+        self.end_headers()
+        self.wfile.flush()
+        sent = 0
+        with open(path, "rb") as handle:
+            try:
+                while sent < length:
+                    count = self.request.sendfile(handle, start + sent, min(SEND_CHUNK_BYTES, length - sent))
+                    if count == 0:
+                        break
+                    sent += count
+            except (BrokenPipeError, ConnectionResetError):
+                self.close_connection = True
+        self.server.count(sent)
+
+
+def random_block() -> bytes:
+    return os.urandom(RANDOM_BLOCK_BYTES)
+
+
+def add_file(archive: zipfile.ZipFile, name: str, data: bytes, mode: int = 0o644) -> None:
+    info = zipfile.ZipInfo(name, date_time=(2025, 1, 1, 0, 0, 0))
+    info.external_attr = (stat.S_IFREG | mode) << 16
+    info.compress_type = zipfile.ZIP_DEFLATED
+    archive.writestr(info, data, compresslevel=1)
+
+
+def add_dir(archive: zipfile.ZipFile, name: str) -> None:
+    info = zipfile.ZipInfo(name.rstrip("/") + "/", date_time=(2025, 1, 1, 0, 0, 0))
+    info.external_attr = (stat.S_IFDIR | 0o755) << 16
+    archive.writestr(info, b"")
+
+
+def add_symlink(archive: zipfile.ZipFile, name: str, target: str) -> None:
+    info = zipfile.ZipInfo(name, date_time=(2025, 1, 1, 0, 0, 0))
+    info.external_attr = (stat.S_IFLNK | 0o755) << 16
+    archive.writestr(info, target)
+
+
+def payload(block: bytes, size: int, seed: int) -> bytes:
+    offset = (seed * 65537) % len(block)
+    data = bytearray()
+    while len(data) < size:
+        data += block[offset:offset + size - len(data)]
+        offset = 0
+    return bytes(data)
+
+
+def build_asset(path: Path, size_bytes: int, tag: str) -> None:
+    block = random_block()
+    root = "LaunchNext.app/Contents"
+    framework = f"{root}/Frameworks/Sparkle.framework"
+    with zipfile.ZipFile(path, "w") as archive:
+        for directory in (
+            "LaunchNext.app",
+            root,
+            f"{root}/MacOS",
+            f"{root}/Resources",
+            f"{root}/Frameworks",
+            framework,
+            f"{framework}/Versions",
+            f"{framework}/Versions/A",
+            f"{framework}/Versions/A/Resources",
+        ):
+            add_dir(archive, directory)
+        plist = (
+            '<?xml version="1.0" encoding="UTF-8"?>\n<plist version="1.0"><dict>'
+            f"<key>CFBundleIdentifier</key><string>io.roversx.launchnext</string>"
+            f"<key>CFBundleShortVersionString</key><string>{tag}</string>"
+            "</dict></plist>\n"
+        )
+        add_file(archive, f"{root}/Info.plist", plist.encode("utf-8"))
+        add_file(archive, f"{root}/PkgInfo", b"APPL????")
+        add_file(archive, f"{framework}/Versions/A/Resources/Info.plist", plist.encode("utf-8"))
+        add_file(archive, f"{framework}/Versions/A/Sparkle", payload(block, 256 * 1024, 1), 0o755)
+        add_symlink(archive, f"{framework}/Versions/Current", "A")
+        add_symlink(archive, f"{framework}/Sparkle", "Versions/Current/Sparkle")
+        add_symlink(archive, f"{framework}/Resources", "Versions/Current/Resources")
+        executable = max(64 * 1024, min(size_bytes // 4, 32 * MB))
+        add_file(archive, f"{root}/MacOS/LaunchNext", payload(block, executable, 2), 0o755)
+        remaining = max(0, size_bytes - executable - 256 * 1024)
+        index = 0
+        while remaining > 0:
+            chunk = min(remaining, RESOURCE_FILE_BYTES)
+            add_file(archive, f"{root}/Resources/resource-{index:04d}.bin", payload(block, chunk, index + 3))
+            remaining -= chunk
+            index += 1
+        for lang in ("en", "zh-Hans", "ja", "ko", "fr", "es", "de", "ru", "hi", "vi"):
+            strings = "".join(f'"key.{n}" = "{lang} value {n}";\n' for n in range(200))
+            add_file(archive, f"{root}/Resources/{lang}.lproj/Localizable.strings", strings.encode("utf-8"))
+
+
+def file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        for chunk in iter(lambda: handle.read(MB), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def write_shims(shim_dir: Path) -> None:
+    shim_dir.mkdir(parents=True, exist_ok=True)
+    scripts = {
+        "open": NOOP_SHIM,
+    }
+    for name, script in scripts.items():
+        path = shim_dir / name
+        path.write_text(script, encoding="utf-8")
+        path.chmod(0o755)
+
+
+def peak_rss_bytes(usage) -> int:
+    if sys.platform == "darwin":
+        return usage.ru_maxrss
+    return usage.ru_maxrss * 1024
+
+
+def stage_stats(trace_path: Path) -> dict:
+    try:
+        events = json.loads(trace_path.read_text(encoding="utf-8")).get("traceEvents", [])
+    except (OSError, ValueError):
+        return {}
+    stages: dict[str, dict] = {}
+    for event in events:
+        if event.get("ph") != "X":
+            continue
+        seconds = event.get("dur", 0) / 1e6
+        entry = stages.setdefault(event["name"], {"count": 0, "seconds": 0.0, "bytes": 0})
+        entry["count"] += 1
+        entry["seconds"] += seconds
+        entry["bytes"] += int(event.get("args", {}).get("bytes", 0) or 0)
+    for entry in stages.values():
+        entry["seconds"] = round(entry["seconds"], 6)
+        if entry["bytes"] and entry["seconds"]:
+            entry["throughput_mb_s"] = round(entry["bytes"] / MB / entry["seconds"], 2)
+    return stages
+
+
+def finished_event(stdout: str) -> Optional[dict]:
+    for line in reversed(stdout.splitlines()):
+        line = line.strip()
+        if not line.startswith("{"):
+            continue
+        try:
+            payload = json.loads(line)
+        except ValueError:
+            continue
+        if isinstance(payload, dict) and "stage" in payload:
+            return payload
+    return None
+
+
+def run_updater(home: Path, shim_dir: Path, server: ApiServer, extra_args: list[str], label: str) -> dict:
+    trace_path = home / f"trace-{label}.json"
+    install_dir = home / "Applications" / "LaunchNext.app"
+    env = dict(os.environ)
+    env.update(
+        HOME=str(home),
+        PATH=f"{shim_dir}{os.pathsep}{env.get('PATH', '')}",
+        LAUNCHNEXT_API_BASE=server.base_url,
+    )
+    command = [
+        sys.executable,
+        str(UPDATER),
+        "--yes",
+        "--emit-json",
+        "--language",
+        "en",
+        "--install-dir",
+        str(install_dir),
+        "--trace",
+        str(trace_path),
+        *extra_args,
+    ]
+    server.take_counters()
+    start = time.perf_counter()
+    with tempfile.TemporaryFile() as stdout, tempfile.TemporaryFile() as stderr:
+        process = subprocess.Popen(command, env=env, stdin=subprocess.DEVNULL, stdout=stdout, stderr=stderr)
+        _, status, usage = os.wait4(process.pid, 0)
+        process.returncode = os.waitstatus_to_exitcode(status)
+        wall = time.perf_counter() - start
+        stdout.seek(0)
+        stderr.seek(0)
+        output = stdout.read().decode("utf-8", errors="replace")
+        errors = stderr.read().decode("utf-8", errors="replace")
+    finished = finished_event(output)
+    result = {
+        "returncode": process.returncode,
+        "wall_seconds": round(wall, 6),
+        "peak_rss_bytes": peak_rss_bytes(usage),
+        "cpu_user_seconds": round(usage.ru_utime, 6),
+        "cpu_system_seconds": round(usage.ru_stime, 6),
+        "server": server.take_counters(),
+        "stages": stage_stats(trace_path),
+        "finished": finished,
+    }
+    if process.returncode != 0:
+        result["stderr"] = errors[-4000:]
+    return result
+
+
+def measure_startup(samples: int, budget_ms: float) -> dict:
+    py_compile.compile(str(UPDATER), doraise=True)
+    code = "\n".join([
+        "import json, sys, types",
+        f"sys.path.insert(0, {str(UPDATER.parent)!r})",
+        f"import {UPDATER.stem}",
+        f"names = {list(DEFERRED_MODULES)!r}",
+        "print(json.dumps([name for name in names if type(sys.modules.get(name)) is types.ModuleType]))",
+    ])
+    timings = []
+    loaded: set[str] = set()
+    for _ in range(samples):
+        process = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", code],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        for line in process.stderr.splitlines():
+            parts = line.split("|")
+            if len(parts) == 3 and line.startswith("import time:") and parts[2].strip() == UPDATER.stem:
+                timings.append(int(parts[1]) / 1000)
+        loaded.update(json.loads(process.stdout.splitlines()[-1]))
+    timings.sort()
+    median = timings[len(timings) // 2]
+    return {
+        "import_ms_median": round(median, 3),
+        "import_ms_min": round(timings[0], 3),
+        "budget_ms": budget_ms,
+        "deferred_modules_loaded": sorted(loaded),
+        "within_budget": median <= budget_ms and not loaded,
+    }
+
+
+def measure_download_loop(server: ApiServer, workdir: Path, size_mb: int, samples: int) -> dict:
+    asset_path = workdir / "assets" / f"download-loop-{size_mb}mb.bin"
+    asset_path.parent.mkdir(parents=True, exist_ok=True)
+    if not asset_path.exists() or asset_path.stat().st_size != size_mb * MB:
+        block = random_block()
+        with open(asset_path, "wb") as handle:
+            for offset in range(0, size_mb * MB, len(block)):
+                handle.write(block[: size_mb * MB - offset])
+    server.release = Release("download-loop", asset_path, "")
+    url = f"{server.base_url}/assets/{asset_path.name}"
+    worker = DOWNLOAD_LOOP_WORKER.format(fixed_chunk=FIXED_CHUNK_BYTES)
+    results: dict = {"size_mb": size_mb, "samples": samples}
+    modes = ("fixed", "adaptive")
+    samples_by_mode: dict[str, list[dict]] = {mode: [] for mode in modes}
+    for index in range(samples * len(modes)):
+        mode = modes[(index + index // len(modes)) % len(modes)]
+        dest = workdir / f"download-loop-{mode}.bin"
+        dest.unlink(missing_ok=True)
+        process = subprocess.run(
+            [sys.executable, "-c", worker, str(UPDATER), mode, url, str(dest), str(size_mb * MB)],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        samples_by_mode[mode].append(json.loads(process.stdout.strip().splitlines()[-1]))
+        dest.unlink(missing_ok=True)
+    for mode, runs in samples_by_mode.items():
+        runs.sort(key=lambda run: run["cpu_seconds"])
+        median = runs[len(runs) // 2]
+        scale = GIB / max(1, median["bytes"])
+        results[mode] = {
+            "cpu_seconds_per_gib": round(median["cpu_seconds"] * scale, 4),
+            "allocated_mb_per_gib": round(median["allocated_bytes"] * scale / MB, 1),
+            "reads_per_gib": round(median["reads"] * scale),
+            "throughput_mb_s": round(median["bytes"] / MB / max(median["wall_seconds"], 1e-9), 1),
+            "final_chunk_bytes": median["final_chunk_bytes"],
+        }
+    fixed, adaptive = results["fixed"], results["adaptive"]
+    results["cpu_reduction"] = round(1 - adaptive["cpu_seconds_per_gib"] / max(fixed["cpu_seconds_per_gib"], 1e-9), 3)
+    results["allocation_reduction"] = round(
+        1 - adaptive["allocated_mb_per_gib"] / max(fixed["allocated_mb_per_gib"], 1e-9), 3
+    )
+    return results
+
+
+def measure_quarantine(workdir: Path, files: int, samples: int) -> dict:
+    root = workdir / f"quarantine-{files}" / "LaunchNext.app"
+    if not root.exists():
+        for index in range(files):
+            path = root / "Contents" / "Resources" / f"d{index // QUARANTINE_FILES_PER_DIR}" / f"f{index}"
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(b"")
+    worker = QUARANTINE_WORKER.format(value=QUARANTINE_VALUE)
+    results: dict = {"files": files, "samples": samples, "attribute": QUARANTINE_ATTRIBUTE}
+    modes = {"serial": 1, "parallel": 0}
+    samples_by_mode: dict[str, list[dict]] = {mode: [] for mode in modes}
+    for index in range(samples * len(modes)):
+        mode = list(modes)[(index + index // len(modes)) % len(modes)]
+        process = subprocess.run(
+            [sys.executable, "-c", worker, str(UPDATER), str(root), QUARANTINE_ATTRIBUTE, str(modes[mode])],
+            capture_output=True,
+            text=True,
+        )
+        if process.returncode != 0:
+            return {**results, "skipped": process.stderr.strip().splitlines()[-1:]}
+        samples_by_mode[mode].append(json.loads(process.stdout.strip().splitlines()[-1]))
+    for mode, runs in samples_by_mode.items():
+        runs.sort(key=lambda run: run["seconds"])
+        median = runs[len(runs) // 2]
+        results[mode] = {
+            "seconds": round(median["seconds"], 4),
+            "items_per_second": round(median["files"] / max(median["seconds"], 1e-9)),
+            "removed": median["removed"],
+            "tagged": median["tagged"],
+            "failures": median["failures"],
+            "workers": median["workers"],
+        }
+    results["speedup"] = round(results["serial"]["seconds"] / max(results["parallel"]["seconds"], 1e-9), 2)
+    return results
+
+
+def compare(results: list[dict], baseline_path: Path) -> None:
+    baseline = json.loads(baseline_path.read_text(encoding="utf-8"))
+    previous = {(run["size_mb"], run["scenario"], run["iteration"]): run for run in baseline.get("runs", [])}
+    for run in results:
+        old = previous.get((run["size_mb"], run["scenario"], run["iteration"]))
+        if not old or not old.get("wall_seconds"):
+            continue
+        run["baseline"] = {
+            "wall_ratio": round(run["wall_seconds"] / old["wall_seconds"], 3),
+            "peak_rss_ratio": round(run["peak_rss_bytes"] / max(1, old["peak_rss_bytes"]), 3),
+        }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Offline LaunchNext updater benchmark")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help="Comma-separated asset sizes in MB")
+    parser.add_argument("--iterations", type=int, default=1)
+    parser.add_argument("--connections", type=int, default=1)
+    parser.add_argument("--install-mode", choices=["delta", "full"], default="delta")
+    parser.add_argument("--workdir", help="Keep generated assets and homes in this directory")
+    parser.add_argument("--output", help="Write the JSON report here instead of stdout")
+    parser.add_argument("--baseline", help="Previous report to compare wall time and peak RSS against")
+    parser.add_argument("--startup-budget-ms", type=float, default=STARTUP_BUDGET_MS)
+    parser.add_argument("--startup-only", action="store_true", help="Only check the cold-start import budget")
+    parser.add_argument(
+        "--download-loop-mb",
+        type=int,
+        default=DOWNLOAD_LOOP_MB,
+        help="Transfer size for the download loop comparison (0 skips it)",
+    )
+    parser.add_argument("--download-loop-only", action="store_true", help="Only compare the download loops")
+    parser.add_argument(
+        "--quarantine-files",
+        type=int,
+        default=QUARANTINE_FILES,
+        help="Bundle size in files for the quarantine removal comparison (0 skips it)",
+    )
+    parser.add_argument("--quarantine-only", action="store_true", help="Only compare quarantine removal")
+    args = parser.parse_args()
+
+    startup = measure_startup(STARTUP_SAMPLES, args.startup_budget_ms)
+    if args.startup_only:
+        print(json.dumps({"startup": startup}, indent=2))
+        return 0 if startup["within_budget"] else 1
+
+    sizes = [int(value) for value in args.sizes.split(",") if value.strip()]
+    workdir = Path(args.workdir) if args.workdir else Path(tempfile.mkdtemp(prefix="launchnext-bench-"))
+    workdir.mkdir(parents=True, exist_ok=True)
+    shim_dir = workdir / "shims"
+    write_shims(shim_dir)
+
+    server = ApiServer()
+    threading.Thread(target=server.serve_forever, name="api-server", daemon=True).start()
+    updater_args = ["--connections", str(args.connections), "--install-mode", args.install_mode]
+
+    runs: list[dict] = []
+    download_loop = None
+    quarantine = None
+    try:
+        if args.download_loop_mb > 0 and not args.quarantine_only:
+            print(f"Comparing download loops over {args.download_loop_mb} MB...", file=sys.stderr)
+            download_loop = measure_download_loop(server, workdir, args.download_loop_mb, DOWNLOAD_LOOP_SAMPLES)
+        if args.quarantine_files > 0 and not args.download_loop_only:
+            print(f"Comparing quarantine removal over {args.quarantine_files} files...", file=sys.stderr)
+            quarantine = measure_quarantine(workdir, args.quarantine_files, QUARANTINE_SAMPLES)
+        if args.download_loop_only or args.quarantine_only:
+            sizes = []
+        for size_mb in sizes:
+            tag = f"v{size_mb}.0.0"
+            asset_path = workdir / "assets" / f"LaunchNext-{tag}.zip"
+            asset_path.parent.mkdir(parents=True, exist_ok=True)
+            if not asset_path.exists():
+                print(f"Generating {size_mb} MB asset...", file=sys.stderr)
+                build_asset(asset_path, size_mb * MB, tag)
+            server.release = Release(tag, asset_path, file_sha256(asset_path))
+            for iteration in range(args.iterations):
+                home = workdir / "homes" / f"{size_mb}mb-{iteration}"
+                shutil.rmtree(home, ignore_errors=True)
+                (home / "Applications").mkdir(parents=True)
+                scenarios = (
+                    ("cold", updater_args),
+                    ("warm", updater_args),
+                    ("download_only", [*updater_args, "--download-only"]),
+                )
+                for scenario, extra in scenarios:
+                    print(f"{size_mb} MB #{iteration} {scenario}", file=sys.stderr)
+                    result = run_updater(home, shim_dir, server, extra, scenario)
+                    runs.append({
+                        "size_mb": size_mb,
+                        "asset_bytes": asset_path.stat().st_size,
+                        "scenario": scenario,
+                        "iteration": iteration,
+                        **result,
+                    })
+    finally:
+        server.shutdown()
+        server.server_close()
+        if not args.workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    if args.baseline:
+        compare(runs, Path(args.baseline))
+    report = {
+        "updater": str(UPDATER),
+        "updater_sha256": file_sha256(UPDATER),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "connections": args.connections,
+        "install_mode": args.install_mode,
+        "startup": startup,
+        "download_loop": download_loop,
+        "quarantine": quarantine,
+        "runs": runs,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(text + "\n", encoding="utf-8")
+    else:
+        print(text)
+    return 0 if startup["within_budget"] and all(run["returncode"] == 0 for run in runs) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,369 +1,188 @@
 #!/usr/bin/env python3
+from __future__ import annotations
+
 import argparse
-import curses
+import atexit
+import concurrent
+import contextlib
+import ctypes
+import errno
+import fcntl
+import functools
+import http
+import importlib.util
+import io
 import json
+import mmap
 import os
+import queue
 import re
 import shutil
-import subprocess
+import stat
+import struct
 import sys
-import tempfile
-import textwrap
-import urllib.request
+import threading
+import time
+import urllib
+import zlib
+from collections import deque
+from collections.abc import Mapping
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Optional
+from urllib.parse import unquote, urljoin, urlsplit
+
+
+LAZY_MODULES: list = []
+
+
+def lazy_import(name: str):
+    module = sys.modules.get(name)
+    if module is None:
+        spec = importlib.util.find_spec(name)
+        loader = importlib.util.LazyLoader(spec.loader)
+        spec.loader = loader
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[name] = module
+        loader.exec_module(module)
+        LAZY_MODULES.append(module)
+        parent, _, child = name.rpartition(".")
+        if parent:
+            setattr(sys.modules[parent], child, module)
+    return module
+
+
+def load_lazy_modules() -> None:
+    # LazyLoader is not thread-safe: finish every deferred import before any worker thread starts.
+    for module in LAZY_MODULES:
+        getattr(module, "__name__")
+
+
+base64 = lazy_import("base64")
+curses = lazy_import("curses")
+random = lazy_import("random")
+gzip = lazy_import("gzip")
+plistlib = lazy_import("plistlib")
+hashlib = lazy_import("hashlib")
+ssl = lazy_import("ssl")
+subprocess = lazy_import("subprocess")
+tempfile = lazy_import("tempfile")
+textwrap = lazy_import("textwrap")
+zipfile = lazy_import("zipfile")
+lazy_import("concurrent.futures")
+lazy_import("http.client")
+lazy_import("http.server")
+lazy_import("urllib.request")
 
 REPO_OWNER = "RoversX"
 REPO_NAME = "LaunchNext"
+API_BASE = os.environ.get("LAUNCHNEXT_API_BASE", "https://api.github.com").rstrip("/")
 DEFAULT_INSTALL = "/Applications/LaunchNext.app"
 DEFAULT_PATTERN = r"LaunchNext.*\.zip"
+LOCALES_DIR = Path(__file__).resolve().parent / "locales"
 CONFIG_NAME = "config.json"
 LOG_NAME = "updater.log"
+LOG_MAX_BYTES = 5 * 1024 * 1024
+LOG_BACKUPS = 5
+LOG_QUEUE_SIZE = 1024
+LOG_BATCH_SIZE = 256
+LOG_FLUSH_SECONDS = 0.2
+METADATA_CACHE_NAME = "release_cache.json"
+RELEASE_INDEX_NAME = "release_index.json"
+RELEASE_INDEX_FRESH_SECONDS = 300
+RELEASE_INDEX_FIELDS = ("id", "tag_name", "name", "html_url", "draft", "prerelease", "published_at", "assets")
+RELEASE_PAGE_SIZE = 100
+RELEASE_PROBE_SIZE = 10
+RELEASE_CHANNELS = ("stable", "beta")
+SEMVER_RE = re.compile(r"[vV]?(\d+)(?:\.(\d+))?(?:\.(\d+))?(?:-([0-9A-Za-z.-]+))?(?:\+[0-9A-Za-z.-]+)?")
+VERSION_CLAUSE_RE = re.compile(r"(>=|<=|>|<|==|=)?\s*(\S+)")
+USER_AGENT = "LaunchNext-Updater"
+HTTP_TIMEOUT_SECONDS = 60
+HTTP_MAX_REDIRECTS = 5
+HTTP_MAX_IDLE_PER_HOST = 8
+HTTP_DRAIN_BYTES = 64 * 1024
+REDIRECT_STATUSES = (301, 302, 303, 307, 308)
+MIRROR_ADDRESS = "0.0.0.0:8787"
+MIRROR_TIMEOUT_SECONDS = 10
+MIRROR_ARCHIVE_RE = re.compile(r"(?:sha256|meta)-[0-9a-f]{64}\.[A-Za-z0-9]+")
+PROFILE_NAME = "updater.pstats"
 DOWNLOADS_SUBDIR = "downloads"
+ARCHIVES_SUBDIR = "archives"
+OBJECTS_SUBDIR = "objects"
+STORE_INDEX_NAME = "store.json"
+STORE_MAX_BYTES = 2 * 1024 * 1024 * 1024
+STORE_KEEP = 3
+ARCHIVE_KEEP = 3
+PARTIAL_MAX_AGE_SECONDS = 24 * 3600
+SNAPSHOTS_SUBDIR = "snapshots"
+SNAPSHOT_MANIFEST_NAME = "snapshot.json"
+SNAPSHOT_KEEP = 2
+STAGED_SUBDIR = "staged"
+STAGED_MANIFEST_NAME = "staged.json"
+PREFETCH_INTERVAL_SECONDS = 6 * 60 * 60
+PREFETCH_JITTER = 0.1
+PREFETCH_NICE = 10
+IOPOL_TYPE_DISK = 0
+IOPOL_SCOPE_PROCESS = 0
+IOPOL_THROTTLE = 3
+IOPRIO_WHO_PROCESS = 1
+IOPRIO_IDLE = 3 << 13
+IOPRIO_SET_SYSCALLS = {"x86_64": 251, "aarch64": 30, "arm64": 30}
+PARTIAL_SUFFIX = ".part"
+CHECKPOINT_BYTES = 8 * 1024 * 1024
+CHECKPOINT_SECONDS = 1.0
+CHUNK_MIN_BYTES = 64 * 1024
+CHUNK_MAX_BYTES = 8 * 1024 * 1024
+CHUNK_TARGET_SECONDS = 0.05
+MIN_SEGMENT_BYTES = 1024 * 1024
+PIPELINE_TAIL_BYTES = 256 * 1024
+EXTRACT_WORKERS = min(8, os.cpu_count() or 1)
+EXTRACT_CHUNK_BYTES = 1024 * 1024
+ZIP_LOCAL_HEADER = "<4s5H3L2H"
+ZIP_LOCAL_SIGNATURE = b"PK\x03\x04"
+AT_FDCWD = -100
+RENAME_EXCHANGE = 1 << 1
+RENAME_SWAP = 0x00000002
+PROGRESS_FRAME_RATE = 15
+THROUGHPUT_WINDOW_SECONDS = 5.0
+THROUGHPUT_SMOOTHING = 0.3
+CLONE_NOFOLLOW = 0x0001
+FICLONE = 0x40049409
+XATTR_NOFOLLOW = 0x0001
+COPY_BUFFER_BYTES = 1024 * 1024
+COPY_UNSUPPORTED = (errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.ENOTSUP, errno.EOPNOTSUPP, errno.ENOTTY)
+XATTR_UNSUPPORTED = (errno.ENOTSUP, errno.EOPNOTSUPP)
+XATTR_MISSING = (errno.ENODATA, getattr(errno, "ENOATTR", errno.ENODATA))
+XATTR_WORKERS = 8
+XATTR_BATCH_SIZE = 256
+QUARANTINE_ATTRIBUTE = "com.apple.quarantine"
+QUARANTINE_FAILURES_LOGGED = 20
+
+
+class LocaleCatalogs(Mapping):
+    def __init__(self, directory: Path, codes: list[str]):
+        self.directory = directory
+        self.codes = list(codes)
+        self.loaded: dict[str, dict] = {}
+
+    def __getitem__(self, code: str) -> dict:
+        if code not in self.codes:
+            raise KeyError(code)
+        table = self.loaded.get(code)
+        if table is None:
+            table = json.loads((self.directory / f"{code}.json").read_text(encoding="utf-8"))
+            self.loaded[code] = table
+        return table
+
+    def __contains__(self, code) -> bool:
+        return code in self.codes
+
+    def __iter__(self):
+        return iter(self.codes)
+
+    def __len__(self) -> int:
+        return len(self.codes)
 
-STRINGS = {
-    "en": {
-        "language_prompt": "Select language:\n  1) English\n  2) 简体中文\n  3) 日本語\n  4) 한국어\n  5) Français\n  6) Español\n  7) Deutsch\n  8) Русский\n  9) हिन्दी\n 10) Tiếng Việt\nEnter choice [1]: ",
-        "language_saved": "Language preference saved.",
-        "fetching": "Fetching release metadata from {url}",
-        "latest_tag": "Latest release tag: {tag}",
-        "asset_selected": "Selected asset: {name} ({size} bytes)",
-        "no_asset": "No release asset matches pattern {pattern}",
-        "no_asset_auto": "No asset matches pattern {pattern}. Available assets: {assets}",
-        "no_assets_available": "Release contains no downloadable assets.",
-        "asset_fallback": "No asset matches pattern {pattern}. Select from available assets:",
-        "prompt_asset_choice": "Select asset [1-{count}] (default 1): ",
-        "downloading": "Downloading asset...",
-        "download_complete": "Downloaded to {path} ({size} bytes)",
-        "extracting": "Extracting archive...",
-        "found_bundle": "Found bundle: {path}",
-        "remove_quarantine_ok": "Removed quarantine attributes",
-        "remove_quarantine_warn": "Warning: failed to remove quarantine attributes",
-        "download_only_path": "Download-only: bundle available at {path}",
-        "install_prepare": "Preparing to install into {path}",
-        "requires_admin": "Administrator privileges required. Please enter your password if prompted.",
-        "install_complete": "Installation complete",
-        "relaunch_warn": "Warning: failed to relaunch LaunchNext automatically",
-        "release_notes": "Release notes: {url}",
-        "update_complete": "Update complete: {tag}",
-        "update_elapsed": "Update finished in {seconds}s",
-        "cancelled": "Update cancelled by user.",
-        "prompt_continue": "Proceed with installation to {path}? [Y/n]: ",
-        "prompt_download_only": "Download without installing? [y/N]: ",
-        "invalid_choice": "Invalid choice.",
-        "download_only_selected": "Download-only mode selected.",
-        "download_and_install": "Download and install selected.",
-        "prompt_language_change": "Change language (current: {lang})? [y/N]: ",
-        "press_enter": "Press Enter to close this window...",
-    },
-    "zh": {
-        "language_prompt": "选择语言：\n  1) English\n  2) 简体中文\n  3) 日本語\n  4) 한국어\n  5) Français\n  6) Español\n  7) Deutsch\n  8) Русский\n  9) हिन्दी\n 10) Tiếng Việt\n请输入序号 [1]：",
-        "language_saved": "语言偏好已保存。",
-        "fetching": "正在获取发布信息：{url}",
-        "latest_tag": "最新版本标签：{tag}",
-        "asset_selected": "已选择资源：{name}（{size} 字节）",
-        "no_asset": "没有资源匹配正则：{pattern}",
-        "no_asset_auto": "没有资源匹配正则 {pattern}。可用资源：{assets}",
-        "no_assets_available": "该发布没有任何可下载资源。",
-        "asset_fallback": "没有资源匹配正则 {pattern}，请选择下列资源：",
-        "prompt_asset_choice": "请选择资源 [1-{count}]（默认 1）：",
-        "downloading": "正在下载资源…",
-        "download_complete": "已下载到 {path}（{size} 字节）",
-        "extracting": "正在解压…",
-        "found_bundle": "找到应用：{path}",
-        "remove_quarantine_ok": "已移除隔离属性",
-        "remove_quarantine_warn": "警告：移除隔离属性失败",
-        "download_only_path": "仅下载模式：应用位于 {path}",
-        "install_prepare": "准备安装到 {path}",
-        "requires_admin": "需要管理员权限，请根据提示输入密码。",
-        "install_complete": "安装完成",
-        "relaunch_warn": "警告：自动重新打开 LaunchNext 失败",
-        "release_notes": "更新说明：{url}",
-        "update_complete": "更新完成：{tag}",
-        "update_elapsed": "本次更新耗时 {seconds} 秒",
-        "cancelled": "用户已取消更新。",
-        "prompt_continue": "即将安装至 {path}，是否继续？[Y/n]：",
-        "prompt_download_only": "是否仅下载而不安装？[y/N]：",
-        "invalid_choice": "输入无效。",
-        "download_only_selected": "已选择仅下载模式。",
-        "download_and_install": "已选择下载并安装。",
-        "prompt_language_change": "更改语言（当前：{lang}）？[y/N]：",
-        "press_enter": "按回车键关闭此窗口…",
-    },
-    "ja": {
-        "language_prompt": "言語を選択してください:\n  1) English\n  2) 简体中文\n  3) 日本語\n  4) 한국어\n  5) Français\n  6) Español\n  7) Deutsch\n  8) Русский\n  9) हिन्दी\n 10) Tiếng Việt\n選択 [1]: ",
-        "language_saved": "言語設定を保存しました。",
-        "fetching": "GitHub からリリース情報を取得中: {url}",
-        "latest_tag": "最新リリースタグ: {tag}",
-        "asset_selected": "選択したアセット: {name} ({size} bytes)",
-        "no_asset": "正規表現 {pattern} に一致するアセットがありません。",
-        "no_asset_auto": "正規表現 {pattern} に一致するアセットがありません。利用可能: {assets}",
-        "no_assets_available": "このリリースにはダウンロード可能なアセットがありません。",
-        "asset_fallback": "正規表現 {pattern} に一致するアセットがありません。次から選択してください:",
-        "prompt_asset_choice": "アセットを選択 [1-{count}] (既定 1): ",
-        "downloading": "アセットをダウンロード中…",
-        "download_complete": "{path} にダウンロードしました ({size} bytes)",
-        "extracting": "アーカイブを展開しています…",
-        "found_bundle": "アプリケーションを検出: {path}",
-        "remove_quarantine_ok": "隔離属性を削除しました",
-        "remove_quarantine_warn": "警告: 隔離属性の削除に失敗しました",
-        "download_only_path": "ダウンロードのみ: {path} に保存されました",
-        "install_prepare": "{path} にインストール準備中",
-        "requires_admin": "管理者権限が必要です。パスワードを入力してください。",
-        "install_complete": "インストール完了",
-        "relaunch_warn": "警告: LaunchNext の再起動に失敗しました",
-        "release_notes": "リリースノート: {url}",
-        "update_complete": "アップデート完了: {tag}",
-        "update_elapsed": "処理時間: {seconds} 秒",
-        "cancelled": "ユーザーがアップデートをキャンセルしました。",
-        "prompt_continue": "{path} にインストールします。続行しますか? [Y/n]: ",
-        "prompt_download_only": "ダウンロードのみ実行しますか? [y/N]: ",
-        "invalid_choice": "無効な入力です。",
-        "download_only_selected": "ダウンロードのみモードを選択しました。",
-        "download_and_install": "ダウンロードしてインストールを選択しました。",
-        "prompt_language_change": "言語を変更しますか (現在: {lang})? [y/N]: ",
-        "press_enter": "閉じるには Enter キーを押してください…",
-    },
-    "ko": {
-        "language_prompt": "언어를 선택하세요:\n  1) English\n  2) 简体中文\n  3) 日本語\n  4) 한국어\n  5) Français\n  6) Español\n  7) Deutsch\n  8) Русский\n  9) हिन्दी\n 10) Tiếng Việt\n선택 [1]: ",
-        "language_saved": "언어 설정이 저장되었습니다.",
-        "fetching": "릴리스 정보를 가져오는 중: {url}",
-        "latest_tag": "최신 릴리스 태그: {tag}",
-        "asset_selected": "선택된 에셋: {name} ({size} bytes)",
-        "no_asset": "정규식 {pattern} 에 일치하는 에셋이 없습니다.",
-        "no_asset_auto": "정규식 {pattern} 에 일치하는 에셋이 없습니다. 사용 가능: {assets}",
-        "no_assets_available": "이 릴리스에는 다운로드할 에셋이 없습니다.",
-        "asset_fallback": "정규식 {pattern} 에 일치하는 에셋이 없습니다. 아래에서 선택하세요:",
-        "prompt_asset_choice": "에셋 선택 [1-{count}] (기본 1): ",
-        "downloading": "에셋 다운로드 중…",
-        "download_complete": "{path} 에 다운로드 완료 ({size} bytes)",
-        "extracting": "압축 해제 중…",
-        "found_bundle": "앱 번들을 찾았습니다: {path}",
-        "remove_quarantine_ok": "격리 속성을 제거했습니다",
-        "remove_quarantine_warn": "경고: 격리 속성 제거 실패",
-        "download_only_path": "다운로드 모드: {path} 위치에 저장",
-        "install_prepare": "{path} 에 설치 준비 중",
-        "requires_admin": "관리자 권한이 필요합니다. 암호를 입력해 주세요.",
-        "install_complete": "설치 완료",
-        "relaunch_warn": "경고: LaunchNext 자동 실행 실패",
-        "release_notes": "릴리스 노트: {url}",
-        "update_complete": "업데이트 완료: {tag}",
-        "update_elapsed": "소요 시간: {seconds}초",
-        "cancelled": "사용자가 업데이트를 취소했습니다.",
-        "prompt_continue": "{path} 에 설치합니다. 계속할까요? [Y/n]: ",
-        "prompt_download_only": "설치 없이 다운로드만 하시겠습니까? [y/N]: ",
-        "invalid_choice": "잘못된 입력입니다.",
-        "download_only_selected": "다운로드 전용 모드가 선택되었습니다.",
-        "download_and_install": "다운로드 후 설치가 선택되었습니다.",
-        "prompt_language_change": "언어를 변경하시겠습니까 (현재: {lang})? [y/N]: ",
-        "press_enter": "창을 닫으려면 Enter 키를 누르세요…",
-    },
-    "fr": {
-        "language_prompt": "Sélectionnez la langue :\n  1) English\n  2) 简体中文\n  3) 日本語\n  4) 한국어\n  5) Français\n  6) Español\n  7) Deutsch\n  8) Русский\n  9) हिन्दी\n 10) Tiếng Việt\nEntrez votre choix [1] : ",
-        "language_saved": "Préférence linguistique enregistrée.",
-        "fetching": "Récupération des métadonnées de la version depuis {url}",
-        "latest_tag": "Dernier tag de version : {tag}",
-        "asset_selected": "Fichier sélectionné : {name} ({size} octets)",
-        "no_asset": "Aucun fichier ne correspond au modèle {pattern}",
-        "no_asset_auto": "Aucun fichier ne correspond au modèle {pattern}. Fichiers disponibles : {assets}",
-        "no_assets_available": "Cette version ne contient aucun fichier téléchargeable.",
-        "asset_fallback": "Aucun fichier ne correspond au modèle {pattern}. Sélectionnez l'un des fichiers suivants :",
-        "prompt_asset_choice": "Sélectionnez un fichier [1-{count}] (par défaut 1) : ",
-        "downloading": "Téléchargement du fichier…",
-        "download_complete": "Téléchargement effectué vers {path} ({size} octets)",
-        "extracting": "Extraction de l’archive…",
-        "found_bundle": "Application trouvée : {path}",
-        "remove_quarantine_ok": "Attributs de quarantaine supprimés",
-        "remove_quarantine_warn": "Avertissement : impossible de supprimer les attributs de quarantaine",
-        "download_only_path": "Mode téléchargement uniquement : application disponible dans {path}",
-        "install_prepare": "Préparation de l’installation dans {path}",
-        "requires_admin": "Privilèges administrateur requis. Veuillez saisir votre mot de passe si nécessaire.",
-        "install_complete": "Installation terminée",
-        "relaunch_warn": "Avertissement : impossible de relancer LaunchNext automatiquement",
-        "release_notes": "Notes de version : {url}",
-        "update_complete": "Mise à jour terminée : {tag}",
-        "update_elapsed": "Mise à jour effectuée en {seconds}s",
-        "cancelled": "Mise à jour annulée par l’utilisateur.",
-        "prompt_continue": "Procéder à l’installation vers {path} ?",
-        "prompt_download_only": "Télécharger sans installer ?",
-        "invalid_choice": "Choix invalide.",
-        "download_only_selected": "Mode téléchargement uniquement sélectionné.",
-        "download_and_install": "Mode téléchargement + installation sélectionné.",
-        "prompt_language_change": "Changer de langue (actuelle : {lang}) ?",
-        "press_enter": "Appuyez sur Entrée pour fermer cette fenêtre…",
-    },
-    "es": {
-        "language_prompt": "Seleccione el idioma:\n  1) English\n  2) 简体中文\n  3) 日本語\n  4) 한국어\n  5) Français\n  6) Español\n  7) Deutsch\n  8) Русский\n  9) हिन्दी\n 10) Tiếng Việt\nOpción [1]: ",
-        "language_saved": "Preferencia de idioma guardada.",
-        "fetching": "Obteniendo metadatos de la versión desde {url}",
-        "latest_tag": "Etiqueta de la última versión: {tag}",
-        "asset_selected": "Recurso seleccionado: {name} ({size} bytes)",
-        "no_asset": "No hay recursos que coincidan con el patrón {pattern}",
-        "no_asset_auto": "No hay recursos que coincidan con el patrón {pattern}. Disponibles: {assets}",
-        "no_assets_available": "Esta versión no contiene recursos descargables.",
-        "asset_fallback": "No hay recursos que coincidan con el patrón {pattern}. Elija uno:",
-        "prompt_asset_choice": "Seleccione un recurso [1-{count}] (predeterminado 1): ",
-        "downloading": "Descargando recurso…",
-        "download_complete": "Descarga completada en {path} ({size} bytes)",
-        "extracting": "Extrayendo el archivo…",
-        "found_bundle": "Aplicación encontrada: {path}",
-        "remove_quarantine_ok": "Atributo de cuarentena eliminado",
-        "remove_quarantine_warn": "Advertencia: no se pudo eliminar el atributo de cuarentena",
-        "download_only_path": "Solo descarga: aplicación disponible en {path}",
-        "install_prepare": "Preparando instalación en {path}",
-        "requires_admin": "Se requieren privilegios de administrador. Introduzca la contraseña si se le solicita.",
-        "install_complete": "Instalación completada",
-        "relaunch_warn": "Advertencia: no se pudo relanzar LaunchNext automáticamente",
-        "release_notes": "Notas de la versión: {url}",
-        "update_complete": "Actualización completada: {tag}",
-        "update_elapsed": "Actualización terminada en {seconds} s",
-        "cancelled": "Actualización cancelada por el usuario.",
-        "prompt_continue": "¿Instalar en {path}? [Y/n]: ",
-        "prompt_download_only": "¿Descargar sin instalar? [y/N]: ",
-        "invalid_choice": "Opción no válida.",
-        "download_only_selected": "Modo solo descarga seleccionado.",
-        "download_and_install": "Modo descargar e instalar seleccionado.",
-        "prompt_language_change": "¿Cambiar idioma (actual: {lang})? [y/N]: ",
-        "press_enter": "Pulse Intro para cerrar esta ventana…",
-    },
-    "de": {
-        "language_prompt": "Sprache auswählen:\n  1) English\n  2) 简体中文\n  3) 日本語\n  4) 한국어\n  5) Français\n  6) Español\n  7) Deutsch\n  8) Русский\n  9) हिन्दी\n 10) Tiếng Việt\nAuswahl [1]: ",
-        "language_saved": "Spracheinstellung gespeichert.",
-        "fetching": "Versionsinformationen werden von {url} abgerufen",
-        "latest_tag": "Neueste Versionskennung: {tag}",
-        "asset_selected": "Ausgewählte Datei: {name} ({size} Bytes)",
-        "no_asset": "Keine Ressource entspricht dem Muster {pattern}",
-        "no_asset_auto": "Keine Ressource entspricht dem Muster {pattern}. Verfügbar: {assets}",
-        "no_assets_available": "Diese Version enthält keine herunterladbaren Dateien.",
-        "asset_fallback": "Keine Ressource entspricht dem Muster {pattern}. Bitte wählen Sie eine aus:",
-        "prompt_asset_choice": "Datei auswählen [1-{count}] (Standard 1): ",
-        "downloading": "Datei wird heruntergeladen…",
-        "download_complete": "Download abgeschlossen nach {path} ({size} Bytes)",
-        "extracting": "Archiv wird entpackt…",
-        "found_bundle": "Anwendung gefunden: {path}",
-        "remove_quarantine_ok": "Quarantäne-Attribut entfernt",
-        "remove_quarantine_warn": "Warnung: Quarantäne-Attribut konnte nicht entfernt werden",
-        "download_only_path": "Nur-Download-Modus: App unter {path} verfügbar",
-        "install_prepare": "Installation in {path} wird vorbereitet",
-        "requires_admin": "Administratorrechte erforderlich. Geben Sie Ihr Passwort ein, wenn Sie dazu aufgefordert werden.",
-        "install_complete": "Installation abgeschlossen",
-        "relaunch_warn": "Warnung: LaunchNext konnte nicht automatisch neu gestartet werden",
-        "release_notes": "Versionshinweise: {url}",
-        "update_complete": "Aktualisierung abgeschlossen: {tag}",
-        "update_elapsed": "Aktualisierung abgeschlossen in {seconds} s",
-        "cancelled": "Aktualisierung vom Benutzer abgebrochen.",
-        "prompt_continue": "Nach {path} installieren? [Y/n]: ",
-        "prompt_download_only": "Nur herunterladen und nicht installieren? [y/N]: ",
-        "invalid_choice": "Ungültige Auswahl.",
-        "download_only_selected": "Nur-Download-Modus ausgewählt.",
-        "download_and_install": "Download-und-Installations-Modus ausgewählt.",
-        "prompt_language_change": "Sprache ändern (aktuell: {lang})? [y/N]: ",
-        "press_enter": "Zum Schließen dieses Fensters die Eingabetaste drücken…",
-    },
-    "ru": {
-        "language_prompt": "Выберите язык:\n  1) English\n  2) 简体中文\n  3) 日本語\n  4) 한국어\n  5) Français\n  6) Español\n  7) Deutsch\n  8) Русский\n  9) हिन्दी\n 10) Tiếng Việt\nВведите номер [1]: ",
-        "language_saved": "Языковые настройки сохранены.",
-        "fetching": "Получение сведений о релизе по адресу {url}",
-        "latest_tag": "Текущий тег релиза: {tag}",
-        "asset_selected": "Выбранный файл: {name} ({size} байт)",
-        "no_asset": "Нет ресурсов, соответствующих шаблону {pattern}",
-        "no_asset_auto": "Нет ресурсов, соответствующих шаблону {pattern}. Доступно: {assets}",
-        "no_assets_available": "В релизе нет файлов для загрузки.",
-        "asset_fallback": "Нет ресурсов, соответствующих шаблону {pattern}. Выберите один из них:",
-        "prompt_asset_choice": "Выберите файл [1-{count}] (по умолчанию 1): ",
-        "downloading": "Загрузка файла…",
-        "download_complete": "Загрузка завершена: {path} ({size} байт)",
-        "extracting": "Распаковка архива…",
-        "found_bundle": "Найдено приложение: {path}",
-        "remove_quarantine_ok": "Атрибут карантина удалён",
-        "remove_quarantine_warn": "Предупреждение: не удалось удалить атрибут карантина",
-        "download_only_path": "Режим только загрузки: приложение доступно по пути {path}",
-        "install_prepare": "Подготовка установки в {path}",
-        "requires_admin": "Требуются права администратора. Введите пароль, если будет запрос.",
-        "install_complete": "Установка завершена",
-        "relaunch_warn": "Предупреждение: не удалось автоматически перезапустить LaunchNext",
-        "release_notes": "Описание релиза: {url}",
-        "update_complete": "Обновление завершено: {tag}",
-        "update_elapsed": "Обновление заняло {seconds} с",
-        "cancelled": "Обновление отменено пользователем.",
-        "prompt_continue": "Установить в {path}? [Y/n]: ",
-        "prompt_download_only": "Скачать без установки? [y/N]: ",
-        "invalid_choice": "Неверный выбор.",
-        "download_only_selected": "Выбран режим только загрузки.",
-        "download_and_install": "Выбран режим загрузки и установки.",
-        "prompt_language_change": "Изменить язык (текущий: {lang})? [y/N]: ",
-        "press_enter": "Нажмите Enter, чтобы закрыть это окно…",
-    },
-    "hi": {
-        "language_prompt": "भाषा चुनें:\n  1) English\n  2) 简体中文\n  3) 日本語\n  4) 한국어\n  5) Français\n  6) Español\n  7) Deutsch\n  8) Русский\n  9) हिन्दी\n 10) Tiếng Việt\nचयन करें [1]: ",
-        "language_saved": "भाषा वरीयता सहेजी गई।",
-        "fetching": "{url} से रिलीज़ मेटाडाटा प्राप्त किया जा रहा है",
-        "latest_tag": "नवीनतम रिलीज़ टैग: {tag}",
-        "asset_selected": "चयनित संसाधन: {name} ({size} बाइट्स)",
-        "no_asset": "{pattern} पैटर्न से मेल खाने वाला कोई संसाधन नहीं है",
-        "no_asset_auto": "{pattern} पैटर्न से मेल खाने वाला कोई संसाधन नहीं है। उपलब्ध: {assets}",
-        "no_assets_available": "इस रिलीज़ में कोई डाउनलोड करने योग्य संसाधन नहीं है।",
-        "asset_fallback": "{pattern} पैटर्न से मेल खाने वाला कोई संसाधन नहीं है। कृपया नीचे से चुनें:",
-        "prompt_asset_choice": "संसाधन चुनें [1-{count}] (डिफ़ॉल्ट 1): ",
-        "downloading": "संसाधन डाउनलोड किया जा रहा है…",
-        "download_complete": "{path} पर डाउनलोड पूरा ({size} बाइट्स)",
-        "extracting": "आर्काइव निकाला जा रहा है…",
-        "found_bundle": "ऐप बंडल मिला: {path}",
-        "remove_quarantine_ok": "क्वारंटीन विशेषता हटाई गई",
-        "remove_quarantine_warn": "चेतावनी: क्वारंटीन विशेषता हटाने में विफल",
-        "download_only_path": "केवल डाउनलोड मोड: ऐप {path} पर उपलब्ध है",
-        "install_prepare": "{path} में इंस्टॉल की तैयारी",
-        "requires_admin": "प्रशासक अधिकार आवश्यक हैं। अनुरोध होने पर पासवर्ड दर्ज करें।",
-        "install_complete": "इंस्टॉलेशन पूरा",
-        "relaunch_warn": "चेतावनी: LaunchNext को स्वतः पुनः खोलने में असफल",
-        "release_notes": "रिलीज़ नोट्स: {url}",
-        "update_complete": "अपडेट पूरा: {tag}",
-        "update_elapsed": "अपडेट को {seconds} सेकंड लगे",
-        "cancelled": "उपयोगकर्ता ने अपडेट रद्द कर दिया।",
-        "prompt_continue": "{path} में इंस्टॉल करें? [Y/n]: ",
-        "prompt_download_only": "बिना इंस्टॉल किए केवल डाउनलोड करें? [y/N]: ",
-        "invalid_choice": "अमान्य विकल्प।",
-        "download_only_selected": "केवल डाउनलोड मोड चुना गया।",
-        "download_and_install": "डाउनलोड और इंस्टॉल मोड चुना गया।",
-        "prompt_language_change": "भाषा बदलें (वर्तमान: {lang})? [y/N]: ",
-        "press_enter": "इस विंडो को बंद करने के लिए Enter दबाएँ…",
-    },
-    "vi": {
-        "language_prompt": "Chọn ngôn ngữ:\n  1) English\n  2) 简体中文\n  3) 日本語\n  4) 한국어\n  5) Français\n  6) Español\n  7) Deutsch\n  8) Русский\n  9) हिन्दी\n 10) Tiếng Việt\nNhập lựa chọn [1]: ",
-        "language_saved": "Đã lưu tùy chọn ngôn ngữ.",
-        "fetching": "Đang lấy thông tin phát hành từ {url}",
-        "latest_tag": "Tag phát hành mới nhất: {tag}",
-        "asset_selected": "Tệp đã chọn: {name} ({size} byte)",
-        "no_asset": "Không có tệp nào khớp với biểu thức {pattern}",
-        "no_asset_auto": "Không có tệp khớp với biểu thức {pattern}. Các tệp sẵn có: {assets}",
-        "no_assets_available": "Bản phát hành này không có tệp có thể tải xuống.",
-        "asset_fallback": "Không có tệp khớp với biểu thức {pattern}. Hãy chọn một trong các tùy chọn sau:",
-        "prompt_asset_choice": "Chọn tệp [1-{count}] (mặc định 1): ",
-        "downloading": "Đang tải xuống…",
-        "download_complete": "Đã tải xuống {path} ({size} byte)",
-        "extracting": "Đang giải nén gói…",
-        "found_bundle": "Đã tìm thấy ứng dụng: {path}",
-        "remove_quarantine_ok": "Đã xóa thuộc tính cách ly",
-        "remove_quarantine_warn": "Cảnh báo: Không thể xóa thuộc tính cách ly",
-        "download_only_path": "Chỉ tải xuống: ứng dụng nằm tại {path}",
-        "install_prepare": "Đang chuẩn bị cài đặt vào {path}",
-        "requires_admin": "Cần quyền quản trị. Nhập mật khẩu khi được yêu cầu.",
-        "install_complete": "Cài đặt hoàn tất",
-        "relaunch_warn": "Cảnh báo: Không thể mở lại LaunchNext tự động",
-        "release_notes": "Ghi chú phát hành: {url}",
-        "update_complete": "Cập nhật hoàn tất: {tag}",
-        "update_elapsed": "Hoàn tất sau {seconds} giây",
-        "cancelled": "Người dùng đã hủy cập nhật.",
-        "prompt_continue": "Cài đặt vào {path}? [Y/n]: ",
-        "prompt_download_only": "Chỉ tải xuống mà không cài đặt? [y/N]: ",
-        "invalid_choice": "Lựa chọn không hợp lệ.",
-        "download_only_selected": "Đã chọn chế độ chỉ tải xuống.",
-        "download_and_install": "Đã chọn chế độ tải xuống và cài đặt.",
-        "prompt_language_change": "Thay đổi ngôn ngữ (hiện tại: {lang})? [y/N]: ",
-        "press_enter": "Nhấn Enter để đóng cửa sổ này…",
-    },
-}
 
 LANG_CODES = {
     "1": "en",
@@ -380,6 +199,7 @@ LANG_CODES = {
 ALLOWED_LANG_CODES = set(LANG_CODES.values())
 LANG_MENU_ORDER = [LANG_CODES[key] for key in sorted(LANG_CODES, key=lambda x: int(x))]
 SUPPORTED_LANG_LIST = list(LANG_MENU_ORDER)
+STRINGS = LocaleCatalogs(LOCALES_DIR, LANG_MENU_ORDER)
 LANG_DISPLAY_NAMES = {
     "en": "English",
     "zh": "简体中文",
@@ -469,8 +289,12 @@ def save_config(config_path: Path, data: dict) -> None:
     config_path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
 
 
-def ensure_language(strings: dict, lang: str) -> dict:
-    return strings.get(lang, strings[DEFAULT_LANG])
+def ensure_language(strings: Mapping, lang: str) -> dict:
+    return strings[lang] if lang in strings else strings[DEFAULT_LANG]
+
+
+def strings_language(strings: dict) -> str:
+    return next((code for code, table in STRINGS.loaded.items() if table is strings), DEFAULT_LANG)
 
 
 def choose_language(config: dict, args, strings) -> str:
@@ -488,22 +312,148 @@ def timestamp() -> str:
     return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
 
 
+class Tracer:
+    def __init__(self):
+        self.origin = time.perf_counter_ns()
+        self.events: list[dict] = []
+        self.threads: dict[int, str] = {}
+        self.lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def span(self, name: str, **fields):
+        start = time.perf_counter_ns()
+        try:
+            yield fields
+        finally:
+            end = time.perf_counter_ns()
+            event = {
+                "name": name,
+                "cat": "updater",
+                "ph": "X",
+                "ts": (start - self.origin) / 1000,
+                "dur": (end - start) / 1000,
+                "pid": os.getpid(),
+                "tid": threading.get_ident(),
+                "args": fields,
+            }
+            with self.lock:
+                self.events.append(event)
+                self.threads[event["tid"]] = threading.current_thread().name
+
+    def summary(self) -> dict:
+        totals: dict[str, float] = {}
+        with self.lock:
+            for event in self.events:
+                totals[event["name"]] = totals.get(event["name"], 0.0) + event["dur"] / 1e6
+        return {name: round(seconds, 6) for name, seconds in totals.items()}
+
+    def write(self, path: Path) -> None:
+        with self.lock:
+            events = list(self.events)
+            metadata = [
+                {"name": "thread_name", "ph": "M", "pid": os.getpid(), "tid": tid, "args": {"name": name}}
+                for tid, name in self.threads.items()
+            ]
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps({"traceEvents": metadata + events, "displayTimeUnit": "ms"}), encoding="utf-8")
+
+
+class LogWriter:
+    def __init__(self, path: Path, max_bytes: int = LOG_MAX_BYTES, backups: int = LOG_BACKUPS):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.queue: queue.Queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.fh = path.open("a", encoding="utf-8")
+        self.closed = False
+        self.thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+        self.thread.start()
+        atexit.register(self.close)
+
+    def write(self, line: str) -> None:
+        if not self.closed:
+            self.queue.put(line)
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        self.closed = True
+        self.queue.put(None)
+        self.thread.join()
+        self.fh.close()
+        atexit.unregister(self.close)
+
+    def _run(self) -> None:
+        while True:
+            batch = [self.queue.get()]
+            deadline = time.monotonic() + LOG_FLUSH_SECONDS
+            while len(batch) < LOG_BATCH_SIZE and batch[-1] is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self.queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            done = None in batch
+            lines = [line for line in batch if line is not None]
+            if lines:
+                payload = "".join(line + "\n" for line in lines)
+                try:
+                    if self.max_bytes and self.fh.tell() + len(payload) > self.max_bytes and self.fh.tell() > 0:
+                        self._rotate()
+                    self.fh.write(payload)
+                    self.fh.flush()
+                except OSError:
+                    pass
+            if done:
+                return
+
+    def _rotate(self) -> None:
+        self.fh.close()
+        for index in range(self.backups - 1, 0, -1):
+            older = self.path.with_name(f"{self.path.name}.{index}.gz")
+            if older.exists():
+                os.replace(older, self.path.with_name(f"{self.path.name}.{index + 1}.gz"))
+        if self.backups > 0:
+            with self.path.open("rb") as src, gzip.open(self.path.with_name(f"{self.path.name}.1.gz"), "wb") as dst:
+                shutil.copyfileobj(src, dst)
+        self.fh = self.path.open("w", encoding="utf-8")
+
+
 class Logger:
-    def __init__(self, path: Path, display=None):
+    def __init__(
+        self,
+        path: Optional[Path],
+        display=None,
+        log_format: str = "text",
+        max_bytes: int = LOG_MAX_BYTES,
+    ):
         self.path = path
         self.display = display
-        path.parent.mkdir(parents=True, exist_ok=True)
-        if not path.exists():
-            path.touch()
+        self.log_format = log_format
+        self.writer = LogWriter(path, max_bytes) if path is not None else None
+        self.lock = threading.Lock()
 
     def log(self, message: str) -> None:
-        line = f"{timestamp()} {message}"
-        if self.display:
-            self.display.log_line(line)
+        stamp = timestamp()
+        line = f"{stamp} {message}"
+        with self.lock:
+            if self.display:
+                self.display.log_line(line)
+            else:
+                print(line)
+        if self.writer is None:
+            return
+        if self.log_format == "json":
+            self.writer.write(json.dumps({"time": stamp, "pid": os.getpid(), "message": message}, ensure_ascii=False))
         else:
-            print(line)
-        with self.path.open("a", encoding="utf-8") as fh:
-            fh.write(line + "\n")
+            self.writer.write(line)
+
+    def close(self) -> None:
+        if self.writer:
+            self.writer.close()
 
     def pause_for_external(self) -> None:
         if self.display:
@@ -513,28 +463,495 @@ class Logger:
         if self.display:
             self.display.resume_after_external()
 
-def fetch_release_metadata(tag: Optional[str], headers: dict) -> dict:
+
+class PooledResponse:
+    def __init__(self, pool: "ConnectionPool", key: tuple, connection, response, url: str, decompress: bool):
+        self.pool = pool
+        self.key = key
+        self.connection = connection
+        self.raw = response
+        self.url = url
+        self.status = response.status
+        self.headers = response.headers
+        self.stream = response
+        if decompress and (response.getheader("Content-Encoding") or "").lower() == "gzip":
+            self.stream = gzip.GzipFile(fileobj=response)
+
+    def read(self, amount: Optional[int] = None) -> bytes:
+        if amount is None or amount < 0:
+            return self.stream.read()
+        return self.stream.read(amount)
+
+    def readinto(self, buffer) -> int:
+        return self.stream.readinto(buffer)
+
+    def close(self) -> None:
+        connection, self.connection = self.connection, None
+        if connection is None:
+            return
+        raw = self.raw
+        if not raw.isclosed() and raw.length is not None and raw.length <= HTTP_DRAIN_BYTES:
+            try:
+                raw.read()
+            except (OSError, http.client.HTTPException):
+                pass
+        if raw.isclosed() and not raw.will_close:
+            self.pool.release(self.key, connection)
+        else:
+            raw.close()
+            connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class ConnectionPool:
+    def __init__(self, timeout: float = HTTP_TIMEOUT_SECONDS, max_idle: int = HTTP_MAX_IDLE_PER_HOST):
+        self.timeout = timeout
+        self.max_idle = max_idle
+        self.idle: dict[tuple, list] = {}
+        self.redirects: dict[str, str] = {}
+        self.lock = threading.Lock()
+        self.ssl_context = None
+        self.proxies: Optional[dict] = None
+        self.timeouts: dict[tuple, float] = {}
+        self.opened = 0
+
+    def set_timeout(self, url: str, timeout: float) -> None:
+        parts = urlsplit(url)
+        with self.lock:
+            self.timeouts[(parts.scheme, parts.hostname, parts.port or (443 if parts.scheme == "https" else 80))] = timeout
+
+    def request(
+        self,
+        url: str,
+        headers: Optional[dict] = None,
+        method: str = "GET",
+        compress: bool = False,
+    ) -> PooledResponse:
+        request_headers = {"User-Agent": USER_AGENT, "Accept-Encoding": "gzip" if compress else "identity"}
+        request_headers.update(headers or {})
+        with self.lock:
+            cached = self.redirects.get(url) if method == "GET" else None
+        if cached:
+            response = self._follow(cached, request_headers, method, compress)
+            if response.status < 400:
+                return response
+            response.close()
+            with self.lock:
+                self.redirects.pop(url, None)
+        response = self._follow(url, request_headers, method, compress)
+        if method == "GET" and response.url != url and response.status < 400:
+            with self.lock:
+                self.redirects[url] = response.url
+        return response
+
+    def _follow(self, url: str, headers: dict, method: str, compress: bool) -> PooledResponse:
+        headers = dict(headers)
+        for _ in range(HTTP_MAX_REDIRECTS + 1):
+            response = self._send(method, url, headers, compress)
+            location = response.headers.get("Location")
+            if response.status not in REDIRECT_STATUSES or not location:
+                return response
+            response.close()
+            target = urljoin(url, location)
+            if urlsplit(target).netloc != urlsplit(url).netloc:
+                headers.pop("Authorization", None)
+            if response.status == 303:
+                method = "GET"
+            url = target
+        raise UpdaterError(f"Too many redirects while fetching {url}")
+
+    def _send(self, method: str, url: str, headers: dict, compress: bool) -> PooledResponse:
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "https") or not parts.hostname:
+            raise UpdaterError(f"Unsupported URL: {url}")
+        key = (parts.scheme, parts.hostname, parts.port or (443 if parts.scheme == "https" else 80))
+        target = parts.path or "/"
+        if parts.query:
+            target += "?" + parts.query
+        for attempt in range(2):
+            connection, reused = self.acquire(key, fresh=attempt > 0)
+            try:
+                connection.request(
+                    method,
+                    url if connection.absolute_target else target,
+                    headers={**headers, **connection.proxy_headers},
+                )
+                response = connection.getresponse()
+            except (ConnectionError, http.client.BadStatusLine):
+                connection.close()
+                if reused and attempt == 0:
+                    self.discard(key)
+                    continue
+                raise
+            except BaseException:
+                connection.close()
+                raise
+            return PooledResponse(self, key, connection, response, url, compress)
+        raise UpdaterError(f"Connection to {parts.hostname} failed")
+
+    def acquire(self, key: tuple, fresh: bool = False):
+        with self.lock:
+            idle = self.idle.get(key)
+            if idle and not fresh:
+                return idle.pop(), True
+            self.opened += 1
+        return self._connect(*key), False
+
+    def discard(self, key: tuple) -> None:
+        with self.lock:
+            idle = self.idle.pop(key, [])
+        for connection in idle:
+            connection.close()
+
+    def release(self, key: tuple, connection) -> None:
+        with self.lock:
+            idle = self.idle.setdefault(key, [])
+            if len(idle) < self.max_idle:
+                idle.append(connection)
+                return
+        connection.close()
+
+    def _connect(self, scheme: str, host: str, port: int):
+        timeout = self.timeouts.get((scheme, host, port), self.timeout)
+        proxy = self._proxy_for(scheme, host)
+        proxy_headers = {}
+        if proxy and proxy.username:
+            credentials = f"{unquote(proxy.username)}:{unquote(proxy.password or '')}".encode("utf-8")
+            proxy_headers["Proxy-Authorization"] = "Basic " + base64.b64encode(credentials).decode("ascii")
+        if scheme == "https":
+            if self.ssl_context is None:
+                self.ssl_context = ssl.create_default_context()
+            if proxy:
+                connection = http.client.HTTPSConnection(
+                    proxy.hostname, proxy.port or 8080, timeout=timeout, context=self.ssl_context
+                )
+                connection.set_tunnel(host, port, headers=proxy_headers)
+            else:
+                connection = http.client.HTTPSConnection(host, port, timeout=timeout, context=self.ssl_context)
+            connection.absolute_target = False
+            connection.proxy_headers = {}
+        elif proxy:
+            connection = http.client.HTTPConnection(proxy.hostname, proxy.port or 8080, timeout=timeout)
+            connection.absolute_target = True
+            connection.proxy_headers = proxy_headers
+        else:
+            connection = http.client.HTTPConnection(host, port, timeout=timeout)
+            connection.absolute_target = False
+            connection.proxy_headers = {}
+        return connection
+
+    def _proxy_for(self, scheme: str, host: str):
+        if self.proxies is None:
+            self.proxies = urllib.request.getproxies()
+        proxy = self.proxies.get(scheme)
+        if not proxy or urllib.request.proxy_bypass(host):
+            return None
+        if "://" not in proxy:
+            proxy = "http://" + proxy
+        return urlsplit(proxy)
+
+    def close(self) -> None:
+        with self.lock:
+            keys = list(self.idle)
+        for key in keys:
+            self.discard(key)
+
+
+HTTP = ConnectionPool()
+
+
+def release_api_path(tag: Optional[str]) -> str:
     if tag:
-        url = f"https://api.github.com/repos/{REPO_OWNER}/{REPO_NAME}/releases/tags/{tag}"
-    else:
-        url = f"https://api.github.com/repos/{REPO_OWNER}/{REPO_NAME}/releases/latest"
-    request = urllib.request.Request(url, headers=headers)
-    with urllib.request.urlopen(request) as response:
-        if response.status != 200:
+        return f"/repos/{REPO_OWNER}/{REPO_NAME}/releases/tags/{tag}"
+    return f"/repos/{REPO_OWNER}/{REPO_NAME}/releases/latest"
+
+
+def release_api_url(tag: Optional[str]) -> str:
+    return API_BASE + release_api_path(tag)
+
+
+def releases_api_url(per_page: int, page: int) -> str:
+    return f"{API_BASE}/repos/{REPO_OWNER}/{REPO_NAME}/releases?per_page={per_page}&page={page}"
+
+
+def mirror_archive_url(mirror: str, asset: dict) -> str:
+    return f"{mirror.rstrip('/')}/{ARCHIVES_SUBDIR}/{archive_store_path(Path(), asset).name}"
+
+
+def write_json_atomic(path: Path, data) -> None:
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_text(json.dumps(data), encoding="utf-8")
+    os.replace(tmp_path, path)
+
+
+def load_metadata_cache(cache_path: Optional[Path]) -> dict:
+    data = {}
+    if cache_path:
+        try:
+            data = json.loads(cache_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            data = {}
+    if not isinstance(data, dict):
+        data = {}
+    data.setdefault("rate_limit", {})
+    data.setdefault("entries", {})
+    return data
+
+
+def save_metadata_cache(cache_path: Path, cache: dict) -> None:
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    write_json_atomic(cache_path, cache)
+
+
+def record_rate_limit(cache: dict, headers) -> None:
+    remaining = headers.get("X-RateLimit-Remaining")
+    reset = headers.get("X-RateLimit-Reset")
+    if remaining is not None and remaining.isdigit():
+        cache["rate_limit"]["remaining"] = int(remaining)
+    if reset is not None and reset.isdigit():
+        cache["rate_limit"]["reset"] = int(reset)
+
+
+def rate_limit_exhausted(cache: dict) -> bool:
+    limit = cache["rate_limit"]
+    return limit.get("remaining") == 0 and time.time() < limit.get("reset", 0)
+
+
+def rate_limit_reset_text(cache: dict) -> str:
+    reset = cache["rate_limit"].get("reset", 0)
+    return datetime.fromtimestamp(reset, timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def fetch_release_metadata(
+    tag: Optional[str],
+    headers: dict,
+    logger: Logger,
+    strings: dict,
+    cache_path: Optional[Path] = None,
+) -> dict:
+    url = release_api_url(tag)
+    cache = load_metadata_cache(cache_path)
+    entry = cache["entries"].get(url)
+    if entry and rate_limit_exhausted(cache):
+        logger.log(strings["metadata_rate_limited"].format(reset=rate_limit_reset_text(cache)))
+        return entry["body"]
+
+    request_headers = dict(headers)
+    if entry and entry.get("etag"):
+        request_headers["If-None-Match"] = entry["etag"]
+    with HTTP.request(url, request_headers, compress=True) as response:
+        record_rate_limit(cache, response.headers)
+        if response.status == 200:
+            body = json.load(response)
+        elif response.status == 304 and entry:
+            logger.log(strings["metadata_not_modified"])
+            body = entry["body"]
+        elif response.status in (403, 429) and rate_limit_exhausted(cache):
+            if cache_path:
+                save_metadata_cache(cache_path, cache)
+            if not entry:
+                raise UpdaterError(f"GitHub API rate limit exceeded until {rate_limit_reset_text(cache)}")
+            logger.log(strings["metadata_rate_limited"].format(reset=rate_limit_reset_text(cache)))
+            return entry["body"]
+        else:
             raise UpdaterError(f"GitHub API returned status {response.status}")
-        return json.load(response)
+        response_headers = response.headers
+
+    cache["entries"][url] = {
+        "etag": response_headers.get("ETag") or (entry or {}).get("etag"),
+        "fetched_at": timestamp(),
+        "body": body,
+    }
+    if cache_path:
+        save_metadata_cache(cache_path, cache)
+    return body
+
+
+def version_key(tag: str) -> Optional[tuple]:
+    match = SEMVER_RE.fullmatch(tag or "")
+    if not match:
+        return None
+    core = tuple(int(part or 0) for part in match.group(1, 2, 3))
+    if not match.group(4):
+        return core + ((1,),)
+    identifiers = tuple(
+        (0, int(part), "") if part.isdigit() else (1, 0, part) for part in match.group(4).split(".")
+    )
+    return core + ((0,) + identifiers,)
+
+
+def version_range(spec: str) -> list[tuple[str, tuple]]:
+    clauses = []
+    for clause in spec.split(","):
+        match = VERSION_CLAUSE_RE.fullmatch(clause.strip())
+        if not match:
+            raise argparse.ArgumentTypeError(f"invalid version range: {spec!r}")
+        op, version = match.groups()
+        if op:
+            key = version_key(version)
+            if key is None:
+                raise argparse.ArgumentTypeError(f"invalid version in range: {version!r}")
+            if op == "<" and key[3] == (1,):
+                key = key[:3] + ((0,),)
+            clauses.append(("==" if op == "=" else op, key))
+            continue
+        parts = version.lstrip("vV").split(".")
+        while parts and parts[-1] in ("x", "X", "*"):
+            parts.pop()
+        if not parts or len(parts) > 3 or not all(part.isdigit() for part in parts):
+            raise argparse.ArgumentTypeError(f"invalid version prefix: {version!r}")
+        clauses.append(("prefix", tuple(int(part) for part in parts)))
+    return clauses
+
+
+def version_in_range(key: tuple, clauses: list[tuple[str, tuple]]) -> bool:
+    for op, bound in clauses:
+        if op == "prefix":
+            matched = key[: len(bound)] == bound
+        elif op == ">=":
+            matched = key >= bound
+        elif op == "<=":
+            matched = key <= bound
+        elif op == ">":
+            matched = key > bound
+        elif op == "<":
+            matched = key < bound
+        else:
+            matched = key == bound
+        if not matched:
+            return False
+    return True
+
+
+def load_release_index(index_path: Path) -> dict:
+    try:
+        data = json.loads(index_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        data = {}
+    if not isinstance(data, dict) or not isinstance(data.get("releases"), list):
+        data = {"releases": []}
+    return data
+
+
+def sync_release_index(
+    headers: dict,
+    logger: Logger,
+    strings: dict,
+    index_path: Path,
+    cache_path: Optional[Path] = None,
+) -> list[dict]:
+    index = load_release_index(index_path)
+    releases = {release.get("id"): release for release in index["releases"]}
+    if releases and time.time() - index.get("synced_at", 0) < RELEASE_INDEX_FRESH_SECONDS:
+        return index["releases"]
+    cache = load_metadata_cache(cache_path)
+    if releases and rate_limit_exhausted(cache):
+        logger.log(strings["metadata_rate_limited"].format(reset=rate_limit_reset_text(cache)))
+        return index["releases"]
+
+    per_page = RELEASE_PROBE_SIZE if releases else RELEASE_PAGE_SIZE
+    fetched: list[dict] = []
+    page = 1
+    while True:
+        url = releases_api_url(per_page, page)
+        request_headers = dict(headers)
+        if page == 1 and index.get("etag") and index.get("etag_url") == url:
+            request_headers["If-None-Match"] = index["etag"]
+        with HTTP.request(url, request_headers, compress=True) as response:
+            record_rate_limit(cache, response.headers)
+            if response.status == 304:
+                break
+            if response.status != 200:
+                if cache_path:
+                    save_metadata_cache(cache_path, cache)
+                if not releases:
+                    raise UpdaterError(f"GitHub API returned status {response.status}")
+                logger.log(f"Release index sync failed with status {response.status}; using cached index")
+                return index["releases"]
+            body = json.load(response)
+            link = response.headers.get("Link") or ""
+            if page == 1:
+                index["etag"] = response.headers.get("ETag")
+                index["etag_url"] = url
+        if not isinstance(body, list):
+            raise UpdaterError("GitHub API returned an unexpected release list")
+        fetched.extend({field: release.get(field) for field in RELEASE_INDEX_FIELDS} for release in body)
+        if not body or any(release.get("id") in releases for release in body) or 'rel="next"' not in link:
+            break
+        page += 1
+
+    changed = [release for release in fetched if releases.get(release["id"]) != release]
+    for release in changed:
+        releases[release["id"]] = release
+    index["releases"] = sorted(releases.values(), key=lambda release: release.get("published_at") or "", reverse=True)
+    index["synced_at"] = time.time()
+    save_metadata_cache(index_path, index)
+    if cache_path:
+        save_metadata_cache(cache_path, cache)
+    if changed:
+        logger.log(strings["release_index_synced"].format(count=len(changed), total=len(releases)))
+    else:
+        logger.log(strings["release_index_current"].format(total=len(releases)))
+    return index["releases"]
+
+
+def select_release(releases: list[dict], channel: str, clauses: Optional[list]) -> Optional[dict]:
+    best = None
+    for release in releases:
+        key = version_key(release.get("tag_name") or "")
+        if release.get("draft") or key is None:
+            continue
+        if channel == "stable" and (release.get("prerelease") or key[3][0] == 0):
+            continue
+        if clauses and not version_in_range(key, clauses):
+            continue
+        if best is None or key > best[0]:
+            best = (key, release)
+    return best[1] if best else None
+
+
+def resolve_release(args, base_dir: Path, logger: Logger, strings: dict, tracer: Tracer) -> dict:
+    if args.tag or (args.channel == "stable" and not args.version_range):
+        logger.log(strings["fetching"].format(url=release_api_url(args.tag)))
+        with tracer.span("metadata", url=release_api_url(args.tag)):
+            return fetch_release_metadata(
+                args.tag,
+                api_headers(),
+                logger,
+                strings,
+                cache_path=base_dir / METADATA_CACHE_NAME,
+            )
+    with tracer.span("release_index", channel=args.channel) as span:
+        releases = sync_release_index(
+            api_headers(),
+            logger,
+            strings,
+            base_dir / RELEASE_INDEX_NAME,
+            cache_path=base_dir / METADATA_CACHE_NAME,
+        )
+        span["releases"] = len(releases)
+    release = select_release(releases, args.channel, args.version_range)
+    if release is None:
+        raise UpdaterError(f"No {args.channel} release matches the requested version")
+    logger.log(strings["release_selected"].format(tag=release.get("tag_name"), channel=args.channel))
+    return release
 
 
 def select_asset(
     metadata: dict, pattern: str, strings: dict, interactive: bool
-) -> tuple[str, str, int, str, str]:
+) -> tuple[str, str, int, str, str, dict]:
     regex = re.compile(pattern)
     for asset in metadata.get("assets", []):
         name = asset.get("name")
         if name and regex.search(name):
             url = asset.get("browser_download_url") or ""
             size = asset.get("size", 0)
-            return name, url, size, metadata.get("tag_name", ""), metadata.get("html_url", "")
+            return name, url, size, metadata.get("tag_name", ""), metadata.get("html_url", ""), asset
 
     assets = metadata.get("assets", [])
     if not assets:
@@ -559,10 +976,55 @@ def select_asset(
             name = selected.get("name", "?")
             url = selected.get("browser_download_url") or ""
             size = selected.get("size", 0)
-            return name, url, size, metadata.get("tag_name", ""), metadata.get("html_url", "")
+            return name, url, size, metadata.get("tag_name", ""), metadata.get("html_url", ""), selected
         print(strings["invalid_choice"])
 
 
+def format_rate(bytes_per_second: float) -> str:
+    return f"{bytes_per_second / (1024 * 1024):.1f} MB/s"
+
+
+def format_eta(seconds: float) -> str:
+    seconds = int(seconds + 0.5)
+    if seconds >= 3600:
+        return f"{seconds // 3600}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+    return f"{seconds // 60}:{seconds % 60:02d}"
+
+
+class ThroughputMeter:
+    def __init__(self, window: float = THROUGHPUT_WINDOW_SECONDS, smoothing: float = THROUGHPUT_SMOOTHING):
+        self.window = window
+        self.smoothing = smoothing
+        self.samples: deque = deque()
+        self.rate: Optional[float] = None
+
+    def reset(self) -> None:
+        self.samples.clear()
+        self.rate = None
+
+    def add(self, current: int) -> None:
+        now = time.monotonic()
+        if self.samples and current < self.samples[-1][1]:
+            self.reset()
+        self.samples.append((now, current))
+        while len(self.samples) > 2 and now - self.samples[0][0] > self.window:
+            self.samples.popleft()
+
+    def update(self) -> None:
+        if len(self.samples) < 2:
+            return
+        (start_time, start_bytes), (end_time, end_bytes) = self.samples[0], self.samples[-1]
+        if end_time <= start_time:
+            return
+        rate = (end_bytes - start_bytes) / (end_time - start_time)
+        self.rate = rate if self.rate is None else self.smoothing * rate + (1 - self.smoothing) * self.rate
+
+    def eta(self, current: int, total: int) -> Optional[float]:
+        if not self.rate or total <= 0 or current >= total:
+            return None
+        return (total - current) / self.rate
+
+
 class CursesSession:
     def __init__(self, stdscr):
         self.stdscr = stdscr
@@ -572,6 +1034,11 @@ class CursesSession:
         self.progress_label: Optional[str] = None
         self.progress_current: int = 0
         self.progress_total: int = 0
+        self.meter = ThroughputMeter()
+        self.frame: dict[int, tuple[int, str, int]] = {}
+        self.frame_size: Optional[tuple[int, int]] = None
+        self.last_render = 0.0
+        self.wrap_cache: tuple[Optional[str], int, list[str]] = (None, 0, [])
         self.color_normal = 0
         self.attr_normal = curses.A_NORMAL
         self.attr_bold = curses.A_BOLD
@@ -597,36 +1064,74 @@ class CursesSession:
         self.stdscr.bkgd(" ", self.color_normal)
         self.stdscr.clear()
 
-    def _refresh(self) -> None:
-        self.stdscr.erase()
-        self.stdscr.bkgd(" ", self.color_normal)
-        height, width = self.stdscr.getmaxyx()
-        safe_addstr(self.stdscr, 0, 2, self.title[: max(0, width - 4)], self.attr_bold)
+    def _invalidate(self) -> None:
+        self.frame = {}
+        self.frame_size = None
+
+    def _wrapped_status(self, width: int) -> list[str]:
+        text, cached_width, lines = self.wrap_cache
+        if text != self.status_line or cached_width != width:
+            lines = wrap_message(self.status_line, width) if self.status_line else []
+            self.wrap_cache = (self.status_line, width, lines)
+        return lines
+
+    def _progress_text(self) -> tuple[str, float]:
+        total = self.progress_total or 0
+        current = self.progress_current
+        if total > 0:
+            percent = int(min(100, max(0, current * 100 / total)))
+            ratio = min(1.0, max(0.0, current / total))
+            text = f"{self.progress_label} {percent:3d}% ({current / (1024 * 1024):.1f}/{total / (1024 * 1024):.1f} MB)"
+        else:
+            ratio = 0.0
+            text = f"{self.progress_label} {current / (1024 * 1024):.1f} MB"
+        if self.meter.rate:
+            text += f"  {format_rate(self.meter.rate)}"
+            eta = self.meter.eta(current, total)
+            if eta is not None:
+                text += f"  ETA {format_eta(eta)}"
+        return text, ratio
+
+    def _compose(self, height: int, width: int) -> dict[int, tuple[int, str, int]]:
+        limit = max(0, width - 4)
+        rows = {0: (2, self.title[:limit], self.attr_bold)}
         cursor_row = 2
-        if self.status_line:
-            lines = wrap_message(self.status_line, max(1, width - 4))
-            for idx, line in enumerate(lines):
-                safe_addstr(self.stdscr, cursor_row + idx, 2, line[: max(0, width - 4)], self.attr_normal)
-            cursor_row += len(lines)
+        for line in self._wrapped_status(max(1, width - 4)):
+            rows[cursor_row] = (2, line[:limit], self.attr_normal)
+            cursor_row += 1
         if self.progress_label:
-            total = self.progress_total or 0
-            current = self.progress_current
-            if total > 0:
-                percent = int(min(100, max(0, current * 100 / total)))
-                ratio = min(1.0, max(0.0, current / total))
-                label_text = f"{self.progress_label} {percent:3d}% ({current / (1024 * 1024):.1f}/{total / (1024 * 1024):.1f} MB)"
-            else:
-                ratio = 0.0
-                label_text = f"{self.progress_label} {current / (1024 * 1024):.1f} MB"
-            safe_addstr(self.stdscr, cursor_row, 2, label_text[: max(0, width - 4)], self.attr_dim)
+            label_text, ratio = self._progress_text()
+            rows[cursor_row] = (2, label_text[:limit], self.attr_dim)
             bar_width = max(10, width - 4)
             filled = int(bar_width * ratio)
-            bar = "█" * filled + " " * (bar_width - filled)
-            safe_addstr(self.stdscr, cursor_row + 1, 2, bar[: max(0, width - 4)], self.attr_highlight)
-            cursor_row += 2
+            rows[cursor_row + 1] = (2, ("█" * filled + " " * (bar_width - filled))[:limit], self.attr_highlight)
         if self.footer:
-            safe_addstr(self.stdscr, height - 2, 2, self.footer[: max(0, width - 4)], self.attr_dim)
-        self.stdscr.refresh()
+            rows[height - 2] = (2, self.footer[:limit], self.attr_dim)
+        return rows
+
+    def _refresh(self) -> None:
+        height, width = self.stdscr.getmaxyx()
+        if self.frame_size != (height, width):
+            self.stdscr.erase()
+            self.stdscr.bkgd(" ", self.color_normal)
+            self.frame = {}
+            self.frame_size = (height, width)
+        self.meter.update()
+        rows = self._compose(height, width)
+        damaged = [y for y in set(self.frame) | set(rows) if self.frame.get(y) != rows.get(y)]
+        for y in damaged:
+            try:
+                self.stdscr.move(y, 0)
+                self.stdscr.clrtoeol()
+            except curses.error:
+                pass
+            if y in rows:
+                x, text, attr = rows[y]
+                safe_addstr(self.stdscr, y, x, text, attr)
+        self.frame = rows
+        self.last_render = time.monotonic()
+        if damaged:
+            self.stdscr.refresh()
 
     def log_line(self, line: str) -> None:
         self.status_line = line
@@ -638,6 +1143,7 @@ class CursesSession:
 
     def resume_after_external(self) -> None:
         curses.reset_prog_mode()
+        self._invalidate()
         self._refresh()
 
     def wait_for_exit(self, prompt: str) -> None:
@@ -655,13 +1161,19 @@ class CursesSession:
         self.progress_label = None
         self.progress_current = 0
         self.progress_total = 0
+        self.meter.reset()
         self._refresh()
 
     def update_progress(self, label: str, current: int, total: Optional[int]) -> None:
+        if label != self.progress_label:
+            self.meter.reset()
         self.progress_label = label
         self.progress_current = current
         self.progress_total = total or 0
-        self._refresh()
+        self.meter.add(current)
+        finished = bool(total) and current >= total
+        if finished or time.monotonic() - self.last_render >= 1.0 / PROGRESS_FRAME_RATE:
+            self._refresh()
 
     def select_language(self, default_code: Optional[str], label_strings: dict) -> str:
         options = [(code, LANG_DISPLAY_NAMES.get(code, code)) for code in LANG_MENU_ORDER]
@@ -670,6 +1182,7 @@ class CursesSession:
         except StopIteration:
             index = 0
 
+        self._invalidate()
         while True:
             self.stdscr.erase()
             self.stdscr.bkgd(" ", self.color_normal)
@@ -708,6 +1221,7 @@ class CursesSession:
         if hint is None:
             hint = YES_NO_HINTS.get(DEFAULT_LANG)
 
+        self._invalidate()
         while True:
             self.stdscr.erase()
             self.stdscr.bkgd(" ", self.color_normal)
@@ -736,6 +1250,366 @@ class CursesSession:
                 return options[selected][0]
 
 
+def archive_key(asset: dict) -> str:
+    digest = asset.get("digest") or ""
+    if digest.startswith("sha256:"):
+        return "sha256-" + digest.split(":", 1)[1].lower()
+    identity = "|".join(str(asset.get(field, "")) for field in ("name", "size", "updated_at", "id"))
+    return "meta-" + hashlib.sha256(identity.encode("utf-8")).hexdigest()
+
+
+def archive_store_path(downloads_dir: Path, asset: dict) -> Path:
+    suffix = Path(asset.get("name") or "").suffix or ".zip"
+    return downloads_dir / ARCHIVES_SUBDIR / f"{archive_key(asset)}{suffix}"
+
+
+def digest_path(archive_path: Path) -> Path:
+    return archive_path.with_name(archive_path.name + ".sha256")
+
+
+def expected_digest(asset: dict, override: Optional[str]) -> Optional[str]:
+    if override:
+        return override.lower().split(":", 1)[-1]
+    digest = asset.get("digest") or ""
+    if digest.startswith("sha256:"):
+        return digest.split(":", 1)[1].lower()
+    return None
+
+
+def cached_archive_digest(archive_path: Path) -> Optional[str]:
+    try:
+        return digest_path(archive_path).read_text(encoding="utf-8").strip() or None
+    except OSError:
+        return None
+
+
+def archive_is_cached(archive_path: Path, expected_size: Optional[int]) -> bool:
+    try:
+        size = archive_path.stat().st_size
+    except OSError:
+        return False
+    return size > 0 and (not expected_size or size == expected_size)
+
+
+def partial_paths(dest: Path) -> tuple[Path, Path]:
+    return dest.with_name(dest.name + PARTIAL_SUFFIX), dest.with_name(dest.name + PARTIAL_SUFFIX + ".json")
+
+
+def load_partial_state(state_path: Path) -> dict:
+    try:
+        data = json.loads(state_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def save_partial_state(state_path: Path, state: dict) -> None:
+    write_json_atomic(state_path, state)
+
+
+def response_validator(response) -> Optional[str]:
+    etag = response.headers.get("ETag")
+    if etag and not etag.startswith("W/"):
+        return etag
+    return response.headers.get("Last-Modified")
+
+
+def content_range_start(response) -> Optional[int]:
+    match = re.match(r"bytes (\d+)-\d+/", response.headers.get("Content-Range", ""))
+    return int(match.group(1)) if match else None
+
+
+def open_asset(url: str, headers: Optional[dict] = None) -> PooledResponse:
+    response = HTTP.request(url, headers)
+    if response.status >= 400:
+        response.close()
+        raise UpdaterError(f"Download failed: HTTP {response.status} for {url}")
+    return response
+
+
+def open_download(url: str, offset: int, validator: Optional[str]):
+    if offset <= 0 or not validator:
+        return open_asset(url), 0
+    response = HTTP.request(url, {
+        "Range": f"bytes={offset}-",
+        "If-Range": validator,
+    })
+    if response.status == 206 and content_range_start(response) == offset and response_validator(response) == validator:
+        return response, offset
+    if response.status == 200:
+        return response, 0
+    response.close()
+    return open_asset(url), 0
+
+
+def content_range_total(response) -> Optional[int]:
+    match = re.match(r"bytes \d+-\d+/(\d+)", response.headers.get("Content-Range", ""))
+    return int(match.group(1)) if match else None
+
+
+def split_segments(size: int, connections: int) -> list[list[int]]:
+    count = max(1, min(connections, size // MIN_SEGMENT_BYTES))
+    step = -(-size // count)
+    return [[start, min(size, start + step), 0] for start in range(0, size, step)]
+
+
+class IncrementalHasher:
+    def __init__(self):
+        self.digest = hashlib.sha256()
+        self.position = 0
+
+    def update(self, offset: int, chunk) -> None:
+        if offset == self.position:
+            self.digest.update(chunk)
+            self.position += len(chunk)
+
+    def catch_up(self, fd: int, frontier: int) -> None:
+        while self.position < frontier:
+            data = os.pread(fd, min(1024 * 1024, frontier - self.position), self.position)
+            if not data:
+                break
+            self.update(self.position, data)
+
+    def hexdigest(self) -> str:
+        return self.digest.hexdigest()
+
+
+class ChunkReader:
+    def __init__(
+        self,
+        minimum: int = CHUNK_MIN_BYTES,
+        maximum: int = CHUNK_MAX_BYTES,
+        target_seconds: float = CHUNK_TARGET_SECONDS,
+    ):
+        self.minimum = minimum
+        self.maximum = maximum
+        self.target_seconds = target_seconds
+        self.size = minimum
+        self.buffer = memoryview(bytearray(minimum))
+
+    def read(self, response, limit: Optional[int] = None) -> memoryview:
+        size = self.size if limit is None else min(self.size, limit)
+        if size > len(self.buffer):
+            self.buffer = memoryview(bytearray(self.size))
+        started = time.perf_counter()
+        count = response.readinto(self.buffer[:size])
+        elapsed = time.perf_counter() - started
+        if count == self.size:
+            if elapsed * 2 < self.target_seconds and self.size < self.maximum:
+                self.size *= 2
+            elif elapsed > self.target_seconds * 2 and self.size > self.minimum:
+                self.size //= 2
+        return self.buffer[:count]
+
+
+def pwrite_all(fd: int, data: memoryview, offset: int) -> None:
+    while data:
+        written = os.pwrite(fd, data, offset)
+        data = data[written:]
+        offset += written
+
+
+def contiguous_frontier(segments: list[list[int]]) -> int:
+    frontier = 0
+    for start, end, done in sorted(segments):
+        if start != frontier:
+            break
+        frontier = start + done
+        if frontier < end:
+            break
+    return frontier
+
+
+def download_stream(
+    url: str,
+    partial_path: Path,
+    state_path: Path,
+    state: dict,
+    logger: Logger,
+    strings: dict,
+    progress_callback,
+    expected_size: Optional[int],
+    hasher: IncrementalHasher,
+    data_callback=None,
+) -> int:
+    offset = 0
+    if "offset" in state:
+        offset = min(int(state["offset"]), partial_path.stat().st_size)
+
+    response, start = open_download(url, offset, state.get("validator"))
+    if offset and start:
+        logger.log(strings["download_resumed"].format(offset=start))
+    elif offset:
+        logger.log(strings["download_restarted"])
+    state = {
+        "url": url,
+        "size": expected_size,
+        "validator": response_validator(response),
+        "offset": start,
+    }
+    total_bytes = start
+    reader = ChunkReader()
+    if not start:
+        partial_path.unlink(missing_ok=True)
+    with response, partial_path.open("r+b" if start else "w+b") as out:
+        if start:
+            out.truncate(start)
+        fd = out.fileno()
+        hasher.catch_up(fd, start)
+        if data_callback and start:
+            data_callback(0, start)
+        checkpoint = total_bytes + CHECKPOINT_BYTES
+        deadline = time.monotonic() + CHECKPOINT_SECONDS
+        try:
+            save_partial_state(state_path, state)
+            while True:
+                chunk = reader.read(response)
+                if not chunk:
+                    break
+                pwrite_all(fd, chunk, total_bytes)
+                hasher.update(total_bytes, chunk)
+                total_bytes += len(chunk)
+                if data_callback:
+                    data_callback(total_bytes - len(chunk), total_bytes)
+                if total_bytes >= checkpoint and time.monotonic() >= deadline:
+                    state["offset"] = total_bytes
+                    save_partial_state(state_path, state)
+                    checkpoint = total_bytes + CHECKPOINT_BYTES
+                    deadline = time.monotonic() + CHECKPOINT_SECONDS
+                if progress_callback:
+                    progress_callback(total_bytes, expected_size)
+        finally:
+            state["offset"] = total_bytes
+            save_partial_state(state_path, state)
+    return total_bytes
+
+
+def open_segment(url: str, start: int, end: int, validator: Optional[str]):
+    headers = {"Range": f"bytes={start}-{end - 1}"}
+    if validator:
+        headers["If-Range"] = validator
+    return open_asset(url, headers)
+
+
+def download_segmented(
+    url: str,
+    partial_path: Path,
+    state_path: Path,
+    state: dict,
+    logger: Logger,
+    strings: dict,
+    progress_callback,
+    expected_size: int,
+    connections: int,
+    hasher: IncrementalHasher,
+    data_callback=None,
+) -> Optional[int]:
+    segments = state.get("segments")
+    validator = state.get("validator")
+    resuming = bool(segments and validator)
+    if not resuming:
+        segments = split_segments(expected_size, connections)
+        validator = None
+    if len(segments) < 2:
+        return None
+
+    pending = [segment for segment in segments if segment[0] + segment[2] < segment[1]]
+    if not pending:
+        return sum(segment[2] for segment in segments)
+    first = pending[0]
+    probe = open_segment(url, first[0] + first[2], first[1], validator)
+    if resuming and probe.status != 206:
+        probe.close()
+        logger.log(strings["download_restarted"])
+        segments = split_segments(expected_size, connections)
+        pending = list(segments)
+        first = pending[0]
+        validator = None
+        probe = open_segment(url, first[0], first[1], None)
+    if (
+        probe.status != 206
+        or content_range_start(probe) != first[0] + first[2]
+        or content_range_total(probe) != expected_size
+        or (validator and response_validator(probe) != validator)
+        or not response_validator(probe)
+    ):
+        probe.close()
+        logger.log(strings["download_single_stream"])
+        return None
+    validator = response_validator(probe)
+
+    if resuming:
+        logger.log(strings["download_resumed"].format(offset=sum(segment[2] for segment in segments)))
+    state = {
+        "url": url,
+        "size": expected_size,
+        "validator": validator,
+        "segments": segments,
+    }
+    lock = threading.Lock()
+    cancelled = threading.Event()
+    progress = {"total": sum(segment[2] for segment in segments), "checkpoint": 0, "deadline": 0.0}
+
+    def fetch(segment: list[int], fd: int, response) -> None:
+        if response is None:
+            response = open_segment(url, segment[0] + segment[2], segment[1], validator)
+        reader = ChunkReader()
+        with response:
+            if (
+                response.status != 206
+                or content_range_start(response) != segment[0] + segment[2]
+                or response_validator(response) != validator
+            ):
+                raise UpdaterError("Server stopped honoring byte-range requests")
+            while not cancelled.is_set():
+                remaining = segment[1] - segment[0] - segment[2]
+                if remaining <= 0:
+                    break
+                chunk = reader.read(response, remaining)
+                if not chunk:
+                    break
+                pwrite_all(fd, chunk, segment[0] + segment[2])
+                if data_callback:
+                    data_callback(segment[0] + segment[2], segment[0] + segment[2] + len(chunk))
+                with lock:
+                    hasher.update(segment[0] + segment[2], chunk)
+                    segment[2] += len(chunk)
+                    hasher.catch_up(fd, contiguous_frontier(segments))
+                    progress["total"] += len(chunk)
+                    if progress["total"] >= progress["checkpoint"] and time.monotonic() >= progress["deadline"]:
+                        save_partial_state(state_path, state)
+                        progress["checkpoint"] = progress["total"] + CHECKPOINT_BYTES
+                        progress["deadline"] = time.monotonic() + CHECKPOINT_SECONDS
+                    if progress_callback:
+                        progress_callback(progress["total"], expected_size)
+        if not cancelled.is_set() and segment[0] + segment[2] < segment[1]:
+            raise UpdaterError(f"Download incomplete: segment at {segment[0]} ended early")
+
+    with partial_path.open("r+b" if resuming else "w+b") as out:
+        out.truncate(expected_size)
+        fd = out.fileno()
+        hasher.catch_up(fd, contiguous_frontier(segments))
+        if data_callback:
+            for start, _, done in segments:
+                data_callback(start, start + done)
+        try:
+            save_partial_state(state_path, state)
+            with concurrent.futures.ThreadPoolExecutor(max_workers=min(connections, len(pending))) as pool:
+                futures = [pool.submit(fetch, first, fd, probe)]
+                futures += [pool.submit(fetch, segment, fd, None) for segment in pending[1:]]
+                try:
+                    for future in concurrent.futures.as_completed(futures):
+                        future.result()
+                except BaseException:
+                    cancelled.set()
+                    raise
+        finally:
+            with lock:
+                save_partial_state(state_path, state)
+        hasher.catch_up(fd, contiguous_frontier(segments))
+    return progress["total"]
+
+
 def download_asset(
     url: str,
     dest: Path,
@@ -743,98 +1617,1664 @@ def download_asset(
     strings: dict,
     progress_callback=None,
     expected_size: Optional[int] = None,
-) -> int:
-    request = urllib.request.Request(url)
-    total_bytes = 0
-    with urllib.request.urlopen(request) as response, dest.open("wb") as out:
-        chunk_size = 1024 * 512
-        while True:
-            chunk = response.read(chunk_size)
-            if not chunk:
-                break
-            out.write(chunk)
-            total_bytes += len(chunk)
-            if progress_callback:
-                progress_callback(total_bytes, expected_size)
+    connections: int = 1,
+    expected_sha256: Optional[str] = None,
+    data_callback=None,
+) -> tuple[int, str]:
+    partial_path, state_path = partial_paths(dest)
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    state = load_partial_state(state_path)
+    if not partial_path.exists() or state.get("url") != url or state.get("size") != expected_size:
+        state = {}
+
+    total_bytes = None
+    hasher = IncrementalHasher()
+    if connections > 1 and expected_size:
+        total_bytes = download_segmented(
+            url, partial_path, state_path, state, logger, strings, progress_callback, expected_size, connections, hasher,
+            data_callback,
+        )
+        if total_bytes is None:
+            state = {}
+            hasher = IncrementalHasher()
+    if total_bytes is None:
+        total_bytes = download_stream(
+            url, partial_path, state_path, state, logger, strings, progress_callback, expected_size, hasher,
+            data_callback,
+        )
+    if expected_size and total_bytes != expected_size:
+        raise UpdaterError(f"Download incomplete: received {total_bytes} of {expected_size} bytes")
+    digest = hasher.hexdigest()
+    if expected_sha256 and digest != expected_sha256:
+        partial_path.unlink(missing_ok=True)
+        state_path.unlink(missing_ok=True)
+        raise UpdaterError(f"SHA-256 mismatch: expected {expected_sha256}, got {digest}")
+    os.replace(partial_path, dest)
+    state_path.unlink(missing_ok=True)
+    digest_path(dest).write_text(digest, encoding="utf-8")
     if progress_callback:
         progress_callback(expected_size or total_bytes, expected_size)
     logger.log(strings["download_complete"].format(path=dest, size=total_bytes))
-    return total_bytes
+    return total_bytes, digest
+
+
+class MissingRange(Exception):
+    def __init__(self, offset: int):
+        super().__init__(f"archive bytes at {offset} have not been received")
+        self.offset = offset
+
 
+class RangeSet:
+    def __init__(self):
+        self.ranges: list[list[int]] = []
 
-def run_subprocess(args: list[str], logger: Logger, error_message: str, elevate: bool = False) -> None:
+    def add(self, start: int, end: int) -> None:
+        if end <= start:
+            return
+        merged = []
+        for current in self.ranges:
+            if current[1] < start or current[0] > end:
+                merged.append(current)
+            else:
+                start = min(start, current[0])
+                end = max(end, current[1])
+        merged.append([start, end])
+        merged.sort()
+        self.ranges = merged
+
+    def covers(self, start: int, end: int) -> bool:
+        return any(lo <= start and end <= hi for lo, hi in self.ranges)
+
+
+class ArchiveView(io.RawIOBase):
+    def __init__(self, fd: Optional[int], size: int, tail_start: int, tail: bytes, received: RangeSet):
+        self.fd = fd
+        self.size = size
+        self.tail_start = tail_start
+        self.tail = tail
+        self.received = received
+        self.position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self.position
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset += self.position
+        elif whence == io.SEEK_END:
+            offset += self.size
+        self.position = max(0, offset)
+        return self.position
+
+    def readinto(self, buffer) -> int:
+        end = min(self.size, self.position + len(buffer))
+        filled = 0
+        while self.position < end:
+            if self.position >= self.tail_start:
+                data = self.tail[self.position - self.tail_start:end - self.tail_start]
+            else:
+                stop = min(end, self.tail_start)
+                if self.fd is None or not self.received.covers(self.position, stop):
+                    raise MissingRange(self.position)
+                data = os.pread(self.fd, stop - self.position, self.position)
+                if not data:
+                    raise MissingRange(self.position)
+            buffer[filled:filled + len(data)] = data
+            filled += len(data)
+            self.position += len(data)
+        return filled
+
+
+def member_parts(name: str) -> list[str]:
+    return [part for part in name.split("/") if part not in ("", ".")]
+
+
+def locate_bundle_root(names: list[str]) -> Optional[str]:
+    candidates = set()
+    for name in names:
+        parts = member_parts(name)
+        if not parts or parts[0] == "__MACOSX" or ".." in parts:
+            continue
+        for depth, part in enumerate(parts):
+            if part.endswith(".app") and (depth < len(parts) - 1 or name.endswith("/")):
+                candidates.add("/".join(parts[: depth + 1]))
+                break
+    if not candidates:
+        return None
+    preferred = f"{REPO_NAME}.app"
+    return min(
+        candidates,
+        key=lambda root: (root.rsplit("/", 1)[-1] != preferred, root.count("/"), root),
+    )
+
+
+def is_symlink_member(info: zipfile.ZipInfo) -> bool:
+    return stat.S_ISLNK(info.external_attr >> 16)
+
+
+def symlink_members(members: list[zipfile.ZipInfo]) -> frozenset:
+    return frozenset(tuple(member_parts(info.filename)) for info in members if is_symlink_member(info))
+
+
+def member_target(info: zipfile.ZipInfo, dest_root: Path, links: frozenset = frozenset()) -> Optional[Path]:
+    parts = member_parts(info.filename)
+    if not parts or info.filename.startswith("/") or ".." in parts or parts[0] == "__MACOSX":
+        return None
+    if any(tuple(parts[:depth]) in links for depth in range(1, len(parts))):
+        raise zipfile.BadZipFile(f"{info.filename} is inside a symlink member")
+    return dest_root.joinpath(*parts)
+
+
+def prepare_member(info: zipfile.ZipInfo, target: Path, dir_modes: list, dest_root: Path) -> bool:
+    root = os.path.realpath(dest_root)
+    parent = os.path.realpath(target.parent)
+    if parent != root and not parent.startswith(root + os.sep):
+        raise zipfile.BadZipFile(f"{info.filename} resolves outside the extraction directory")
+    mode = info.external_attr >> 16
+    if info.is_dir():
+        target.mkdir(parents=True, exist_ok=True)
+        if mode:
+            dir_modes.append((target, stat.S_IMODE(mode)))
+        return False
+    target.parent.mkdir(parents=True, exist_ok=True)
+    if target.is_symlink() or target.exists():
+        target.unlink()
+    return True
+
+
+def restore_member_mtime(info: zipfile.ZipInfo, target: Path) -> None:
+    mtime = time.mktime(info.date_time + (0, 0, -1))
+    if os.utime in os.supports_follow_symlinks:
+        os.utime(target, (mtime, mtime), follow_symlinks=False)
+    elif not target.is_symlink():
+        os.utime(target, (mtime, mtime))
+
+
+def extract_zip_member(
+    archive: zipfile.ZipFile, info: zipfile.ZipInfo, dest_root: Path, dir_modes: list, links: frozenset
+) -> None:
+    target = member_target(info, dest_root, links)
+    if target is None or not prepare_member(info, target, dir_modes, dest_root):
+        return
+    mode = info.external_attr >> 16
     try:
-        subprocess.run(args, check=True)
-    except subprocess.CalledProcessError as exc:
-        logger.log(f"{error_message}: {exc}")
-        raise UpdaterError(error_message) from exc
+        with archive.open(info) as src, target.open("wb") as out:
+            shutil.copyfileobj(src, out, 1024 * 1024)
+    except zlib.error as exc:
+        raise zipfile.BadZipFile(f"{info.filename} is corrupt: {exc}") from exc
+    os.chmod(target, stat.S_IMODE(mode) if mode else 0o644)
+    restore_member_mtime(info, target)
 
 
-def remove_quarantine(bundle: Path, logger: Logger, strings: dict) -> None:
+def member_chunks(mapped: mmap.mmap, info: zipfile.ZipInfo):
     try:
-        subprocess.run(["xattr", "-dr", "com.apple.quarantine", str(bundle)], check=True)
-        logger.log(strings["remove_quarantine_ok"])
-    except subprocess.CalledProcessError:
-        logger.log(strings["remove_quarantine_warn"])
-
-
-def install_bundle(bundle: Path, target: Path, logger: Logger, strings: dict) -> None:
-    logger.log(strings["install_prepare"].format(path=target))
-
-    def do_install():
-        target.parent.mkdir(parents=True, exist_ok=True)
-        if target.exists():
-            shutil.rmtree(target)
-        subprocess.run([
-            "ditto",
-            "--rsrc",
-            "--preserveHFSCompression",
-            str(bundle),
-            str(target),
-        ], check=True)
-
-    needs_privilege = not str(target).startswith(str(Path.home()))
-    if needs_privilege:
-        logger.log(strings["requires_admin"])
-        with tempfile.NamedTemporaryFile("w", delete=False, suffix=".sh") as tmp:
-            tmp.write(
-                f"#!/bin/bash\n"
-                "set -euo pipefail\n"
-                f"mkdir -p \"{target.parent}\"\n"
-                f"rm -rf \"{target}\"\n"
-                f"ditto --rsrc --preserveHFSCompression \"{bundle}\" \"{target}\"\n"
+        header = struct.unpack_from(ZIP_LOCAL_HEADER, mapped, info.header_offset)
+    except struct.error as exc:
+        raise zipfile.BadZipFile(f"Bad local header for {info.filename}") from exc
+    if header[0] != ZIP_LOCAL_SIGNATURE:
+        raise zipfile.BadZipFile(f"Bad local header for {info.filename}")
+    if info.flag_bits & 0x1:
+        raise zipfile.BadZipFile(f"{info.filename} is encrypted")
+    start = info.header_offset + struct.calcsize(ZIP_LOCAL_HEADER) + header[-2] + header[-1]
+    end = start + info.compress_size
+    if end > len(mapped):
+        raise zipfile.BadZipFile(f"{info.filename} is truncated")
+    if info.compress_type == zipfile.ZIP_STORED:
+        for position in range(start, end, EXTRACT_CHUNK_BYTES):
+            yield mapped[position:min(end, position + EXTRACT_CHUNK_BYTES)]
+        return
+    if info.compress_type != zipfile.ZIP_DEFLATED:
+        raise zipfile.BadZipFile(f"{info.filename} uses unsupported compression {info.compress_type}")
+    decompressor = zlib.decompressobj(-zlib.MAX_WBITS)
+    try:
+        for position in range(start, end, EXTRACT_CHUNK_BYTES):
+            data = mapped[position:min(end, position + EXTRACT_CHUNK_BYTES)]
+            while data:
+                yield decompressor.decompress(data, EXTRACT_CHUNK_BYTES)
+                data = decompressor.unconsumed_tail
+        tail = decompressor.flush()
+    except zlib.error as exc:
+        raise zipfile.BadZipFile(f"{info.filename} is corrupt: {exc}") from exc
+    yield tail
+    if not decompressor.eof:
+        raise zipfile.BadZipFile(f"{info.filename} is truncated")
+
+
+def extract_mapped_member(mapped: mmap.mmap, info: zipfile.ZipInfo, target: Path) -> int:
+    mode = info.external_attr >> 16
+    crc = 0
+    size = 0
+    if stat.S_ISLNK(mode):
+        link = bytearray()
+        for chunk in member_chunks(mapped, info):
+            crc = zlib.crc32(chunk, crc)
+            link += chunk
+        size = len(link)
+    else:
+        fd = os.open(target, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_CLOEXEC", 0), 0o600)
+        try:
+            for chunk in member_chunks(mapped, info):
+                crc = zlib.crc32(chunk, crc)
+                pwrite_all(fd, memoryview(chunk), size)
+                size += len(chunk)
+        finally:
+            os.close(fd)
+    if size != info.file_size or crc != info.CRC:
+        raise zipfile.BadZipFile(f"Bad CRC-32 for {info.filename}")
+    if stat.S_ISLNK(mode):
+        os.symlink(link.decode("utf-8"), target)
+    else:
+        os.chmod(target, stat.S_IMODE(mode) if mode else 0o644)
+    restore_member_mtime(info, target)
+    return size
+
+
+def extract_mapped_members(
+    mapped: mmap.mmap,
+    members: list[zipfile.ZipInfo],
+    dest_root: Path,
+    dir_modes: list,
+    progress_callback=None,
+    done: int = 0,
+    total: Optional[int] = None,
+) -> int:
+    links = symlink_members(members)
+    files = []
+    for info in members:
+        target = member_target(info, dest_root, links)
+        if target is not None and not is_symlink_member(info) and prepare_member(info, target, dir_modes, dest_root):
+            files.append((info, target))
+    files.sort(key=lambda item: item[0].compress_size, reverse=True)
+    with concurrent.futures.ThreadPoolExecutor(EXTRACT_WORKERS, thread_name_prefix="extract") as pool:
+        futures = [pool.submit(extract_mapped_member, mapped, info, target) for info, target in files]
+        try:
+            for future in concurrent.futures.as_completed(futures):
+                done += future.result()
+                if progress_callback:
+                    progress_callback(done, total)
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            raise
+    for info in members:
+        target = member_target(info, dest_root, links)
+        if target is not None and is_symlink_member(info) and prepare_member(info, target, dir_modes, dest_root):
+            done += extract_mapped_member(mapped, info, target)
+    return done
+
+
+def select_bundle_members(archive: zipfile.ZipFile, size: int) -> tuple[Optional[str], list[tuple[zipfile.ZipInfo, int]]]:
+    members = sorted(archive.infolist(), key=lambda item: item.header_offset)
+    bounds = [item.header_offset for item in members[1:]] + [getattr(archive, "start_dir", size)]
+    bundle_root = locate_bundle_root([item.filename for item in members])
+    root_parts = member_parts(bundle_root or "")
+    selected = [
+        (info, end)
+        for info, end in zip(members, bounds)
+        if root_parts and member_parts(info.filename)[: len(root_parts)] == root_parts
+    ]
+    return bundle_root, selected
+
+
+def extract_archive(archive_path: Path, extract_dir: Path, progress_callback=None) -> Optional[Path]:
+    dir_modes: list[tuple[Path, int]] = []
+    with archive_path.open("rb") as handle:
+        size = os.fstat(handle.fileno()).st_size
+        with zipfile.ZipFile(handle) as archive:
+            bundle_root, selected = select_bundle_members(archive, size)
+        if not bundle_root:
+            return None
+        members = [info for info, _ in selected]
+        with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            extract_mapped_members(
+                mapped,
+                members,
+                extract_dir,
+                dir_modes,
+                progress_callback,
+                total=sum(info.file_size for info in members),
             )
-            temp_path = Path(tmp.name)
-        temp_path.chmod(0o755)
+    for path, mode in reversed(dir_modes):
+        os.chmod(path, mode)
+    return extract_dir.joinpath(*bundle_root.split("/"))
+
+
+class ArchivePipeline:
+    def __init__(self, partial_path: Path, size: Optional[int], dest_root: Path, tracer: Optional[Tracer] = None):
+        self.partial_path = partial_path
+        self.tracer = tracer or Tracer()
+        self.size = size
+        self.dest_root = dest_root
+        self.received = RangeSet()
+        self.condition = threading.Condition()
+        self.fd: Optional[int] = None
+        self.archive: Optional[zipfile.ZipFile] = None
+        self.view: Optional[ArchiveView] = None
+        self.pending: list[tuple[zipfile.ZipInfo, int]] = []
+        self.links: list[zipfile.ZipInfo] = []
+        self.link_parts: frozenset = frozenset()
+        self.bundle_root: Optional[str] = None
+        self.dir_modes: list[tuple[Path, int]] = []
+        self.total_bytes = 0
+        self.extracted_bytes = 0
+        self.stopped = False
+        self.error: Optional[BaseException] = None
+        self.worker = threading.Thread(target=self._run, name="archive-pipeline", daemon=True)
+        self.worker.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        with self.condition:
+            self.stopped = True
+            self.condition.notify_all()
+        self.worker.join()
+        if self.archive:
+            self.archive.close()
+            self.archive = None
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
+
+    def load_directory_from_url(self, url: str) -> bool:
+        if not self.size:
+            return False
+        tail_start = max(0, self.size - PIPELINE_TAIL_BYTES)
+        for _ in range(3):
+            try:
+                with HTTP.request(url, {"Range": f"bytes={tail_start}-"}) as response:
+                    if (
+                        response.status != 206
+                        or content_range_start(response) != tail_start
+                        or content_range_total(response) != self.size
+                    ):
+                        return False
+                    tail = response.read()
+            except (OSError, http.client.HTTPException):
+                return False
+            if len(tail) != self.size - tail_start:
+                return False
+            try:
+                self._set_directory(ArchiveView(None, self.size, tail_start, tail, RangeSet()), tail_start)
+                return True
+            except MissingRange as exc:
+                tail_start = exc.offset
+            except zipfile.BadZipFile:
+                return False
+        return False
+
+    def data_received(self, start: int, end: int) -> None:
+        with self.condition:
+            if self.fd is None:
+                self.fd = os.open(self.partial_path, os.O_RDONLY)
+                if self.view:
+                    self.view.fd = self.fd
+            self.received.add(start, end)
+            self.condition.notify_all()
+
+    @property
+    def bundle_path(self) -> Optional[Path]:
+        if not self.bundle_root:
+            return None
+        return self.dest_root.joinpath(*self.bundle_root.split("/"))
+
+    def finish(self, archive_path: Path, progress_callback=None) -> None:
+        with self.condition:
+            self.stopped = True
+            self.condition.notify_all()
+        self.worker.join()
+        if self.error:
+            raise self.error
+        with archive_path.open("rb") as handle:
+            size = os.fstat(handle.fileno()).st_size
+            if self.archive is None:
+                with zipfile.ZipFile(handle) as archive:
+                    self.bundle_root, self.pending = select_bundle_members(archive, size)
+                self.total_bytes = sum(info.file_size for info, _ in self.pending)
+            members = [info for info, _ in self.pending] + self.links
+            self.pending = []
+            self.links = []
+            with self.tracer.span("extract_parallel", members=len(members), workers=EXTRACT_WORKERS):
+                with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    self.extracted_bytes = extract_mapped_members(
+                        mapped,
+                        members,
+                        self.dest_root,
+                        self.dir_modes,
+                        progress_callback,
+                        self.extracted_bytes,
+                        self.total_bytes,
+                    )
+        for path, mode in reversed(self.dir_modes):
+            os.chmod(path, mode)
+
+    def _set_directory(self, view: ArchiveView, tail_start: int) -> None:
+        archive = zipfile.ZipFile(view)
+        bundle_root, selected = select_bundle_members(archive, view.size)
+        links = [info for info, _ in selected if is_symlink_member(info)]
+        with self.condition:
+            view.fd = self.fd
+            view.received = self.received
+            self.view = view
+            self.archive = archive
+            self.bundle_root = bundle_root
+            self.received.add(tail_start, view.size)
+            self.pending = [(info, end) for info, end in selected if not is_symlink_member(info)]
+            self.links = links
+            self.link_parts = symlink_members(links)
+            self.total_bytes = sum(info.file_size for info, _ in selected)
+            self.condition.notify_all()
+
+    def _next_ready(self) -> Optional[tuple[zipfile.ZipInfo, int]]:
+        for index, (info, end) in enumerate(self.pending):
+            if self.received.covers(info.header_offset, end):
+                return self.pending.pop(index)
+        return None
+
+    def _run(self) -> None:
+        with self.tracer.span("extract_members") as span:
+            span["members"] = 0
+            span["bytes"] = 0
+            self._extract_ready(span)
+
+    def _extract_ready(self, span: dict) -> None:
+        while True:
+            with self.condition:
+                member = None
+                while not self.stopped:
+                    if self.archive is not None:
+                        member = self._next_ready()
+                        if member:
+                            break
+                    self.condition.wait()
+                if member is None:
+                    return
+                archive = self.archive
+            try:
+                extract_zip_member(archive, member[0], self.dest_root, self.dir_modes, self.link_parts)
+                span["members"] += 1
+                span["bytes"] += member[0].file_size
+                self.extracted_bytes += member[0].file_size
+            except BaseException as exc:
+                with self.condition:
+                    self.error = exc
+                    self.stopped = True
+                return
+
+
+def remove_quarantine(bundle: Path, logger: Logger, strings: dict, name: str = QUARANTINE_ATTRIBUTE) -> dict:
+    report = strip_xattr_tree(bundle, name)
+    failures = report["failures"]
+    if not failures:
+        logger.log(strings["remove_quarantine_ok"].format(removed=report["removed"], files=report["files"]))
+        return report
+    logger.log(strings["remove_quarantine_warn"].format(count=len(failures), files=report["files"]))
+    for path, error in failures[:QUARANTINE_FAILURES_LOGGED]:
+        logger.log(f"  {path}: {error}")
+    if len(failures) > QUARANTINE_FAILURES_LOGGED:
+        logger.log(f"  ... and {len(failures) - QUARANTINE_FAILURES_LOGGED} more")
+    return report
+
+
+@functools.lru_cache(maxsize=None)
+def darwin_libc():
+    libc = ctypes.CDLL(None, use_errno=True)
+    libc.listxattr.argtypes = [ctypes.c_char_p, ctypes.c_char_p, ctypes.c_size_t, ctypes.c_int]
+    libc.listxattr.restype = ctypes.c_ssize_t
+    libc.getxattr.argtypes = [
+        ctypes.c_char_p, ctypes.c_char_p, ctypes.c_void_p, ctypes.c_size_t, ctypes.c_uint32, ctypes.c_int
+    ]
+    libc.getxattr.restype = ctypes.c_ssize_t
+    libc.setxattr.argtypes = [
+        ctypes.c_char_p, ctypes.c_char_p, ctypes.c_void_p, ctypes.c_size_t, ctypes.c_uint32, ctypes.c_int
+    ]
+    libc.setxattr.restype = ctypes.c_int
+    libc.removexattr.argtypes = [ctypes.c_char_p, ctypes.c_char_p, ctypes.c_int]
+    libc.removexattr.restype = ctypes.c_int
+    libc.clonefile.argtypes = [ctypes.c_char_p, ctypes.c_char_p, ctypes.c_uint32]
+    libc.clonefile.restype = ctypes.c_int
+    return libc
+
+
+def raise_errno(path: str) -> None:
+    err = ctypes.get_errno()
+    raise OSError(err, os.strerror(err), path)
+
+
+def list_xattrs(path: str) -> list[str]:
+    if hasattr(os, "listxattr"):
+        return os.listxattr(path, follow_symlinks=False)
+    if sys.platform != "darwin":
+        return []
+    libc = darwin_libc()
+    encoded = os.fsencode(path)
+    size = libc.listxattr(encoded, None, 0, XATTR_NOFOLLOW)
+    if size < 0:
+        raise_errno(path)
+    if size == 0:
+        return []
+    buffer = ctypes.create_string_buffer(size)
+    size = libc.listxattr(encoded, buffer, size, XATTR_NOFOLLOW)
+    if size < 0:
+        raise_errno(path)
+    return [os.fsdecode(name) for name in buffer.raw[:size].split(b"\0") if name]
+
+
+def get_xattr(path: str, name: str) -> bytes:
+    if hasattr(os, "getxattr"):
+        return os.getxattr(path, name, follow_symlinks=False)
+    libc = darwin_libc()
+    encoded, key = os.fsencode(path), os.fsencode(name)
+    size = libc.getxattr(encoded, key, None, 0, 0, XATTR_NOFOLLOW)
+    if size < 0:
+        raise_errno(path)
+    buffer = ctypes.create_string_buffer(max(1, size))
+    size = libc.getxattr(encoded, key, buffer, size, 0, XATTR_NOFOLLOW)
+    if size < 0:
+        raise_errno(path)
+    return buffer.raw[:size]
+
+
+def set_xattr(path: str, name: str, value: bytes) -> None:
+    if hasattr(os, "setxattr"):
+        os.setxattr(path, name, value, follow_symlinks=False)
+        return
+    libc = darwin_libc()
+    if libc.setxattr(os.fsencode(path), os.fsencode(name), value, len(value), 0, XATTR_NOFOLLOW) != 0:
+        raise_errno(path)
+
+
+def remove_xattr(path: str, name: str) -> None:
+    if hasattr(os, "removexattr"):
+        os.removexattr(path, name, follow_symlinks=False)
+        return
+    libc = darwin_libc()
+    if libc.removexattr(os.fsencode(path), os.fsencode(name), XATTR_NOFOLLOW) != 0:
+        raise_errno(path)
+
+
+def strip_xattr_batch(paths: list[str], name: str) -> tuple[int, list[tuple[str, str]]]:
+    removed = 0
+    failures = []
+    for path in paths:
+        try:
+            if name in list_xattrs(path):
+                remove_xattr(path, name)
+                removed += 1
+        except OSError as exc:
+            if exc.errno not in XATTR_UNSUPPORTED + XATTR_MISSING:
+                failures.append((path, exc.strerror or str(exc)))
+    return removed, failures
+
+
+def strip_xattr_tree(root: Path, name: str, workers: int = XATTR_WORKERS) -> dict:
+    report = {"files": 0, "removed": 0, "failures": []}
+    futures = []
+    with concurrent.futures.ThreadPoolExecutor(max(1, workers), thread_name_prefix="xattr") as pool:
+        batch = [str(root)]
+        pending = [str(root)] if root.is_dir() and not root.is_symlink() else []
+        while pending:
+            directory = pending.pop()
+            try:
+                with os.scandir(directory) as it:
+                    for entry in it:
+                        batch.append(entry.path)
+                        if entry.is_dir(follow_symlinks=False):
+                            pending.append(entry.path)
+                        if len(batch) >= XATTR_BATCH_SIZE:
+                            futures.append(pool.submit(strip_xattr_batch, batch, name))
+                            report["files"] += len(batch)
+                            batch = []
+            except OSError as exc:
+                report["failures"].append((directory, exc.strerror or str(exc)))
+        if batch:
+            futures.append(pool.submit(strip_xattr_batch, batch, name))
+            report["files"] += len(batch)
+    for future in futures:
+        removed, failures = future.result()
+        report["removed"] += removed
+        report["failures"].extend(failures)
+    return report
+
+
+def copy_xattrs(src: str, dst: str) -> None:
+    try:
+        names = list_xattrs(src)
+    except OSError as exc:
+        if exc.errno in XATTR_UNSUPPORTED:
+            return
+        raise
+    for name in names:
+        try:
+            set_xattr(dst, name, get_xattr(src, name))
+        except OSError as exc:
+            if exc.errno not in XATTR_UNSUPPORTED + (errno.EPERM, errno.EACCES):
+                raise
+
+
+def copy_metadata(src: str, dst: str, src_stat: os.stat_result) -> None:
+    if stat.S_ISLNK(src_stat.st_mode):
+        if os.utime in os.supports_follow_symlinks:
+            os.utime(dst, ns=(src_stat.st_atime_ns, src_stat.st_mtime_ns), follow_symlinks=False)
+        return
+    copy_xattrs(src, dst)
+    os.chmod(dst, stat.S_IMODE(src_stat.st_mode))
+    os.utime(dst, ns=(src_stat.st_atime_ns, src_stat.st_mtime_ns))
+
+
+def walk_tree(src: str, dst: str, files: list, directories: list) -> None:
+    os.mkdir(dst, 0o700)
+    directories.append((src, dst))
+    with os.scandir(src) as it:
+        for entry in it:
+            path = os.path.join(dst, entry.name)
+            if entry.is_symlink():
+                os.symlink(os.readlink(entry.path), path)
+                copy_metadata(entry.path, path, entry.stat(follow_symlinks=False))
+            elif entry.is_dir(follow_symlinks=False):
+                walk_tree(entry.path, path, files, directories)
+            else:
+                files.append((entry.path, path))
+
+
+def fill_tree(src: Path, dst: Path, place_file, workers: int = 1) -> None:
+    files: list[tuple[str, str]] = []
+    directories: list[tuple[str, str]] = []
+    walk_tree(str(src), str(dst), files, directories)
+    if len(files) > 1 and workers > 1:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as pool:
+            for future in [pool.submit(place_file, *job) for job in files]:
+                future.result()
+    else:
+        for job in files:
+            place_file(*job)
+    for source, target in reversed(directories):
+        copy_metadata(source, target, os.lstat(source))
+
+
+class CopyEngine:
+    METHODS = ("clone", "copy_file_range", "sendfile", "buffered")
+
+    def __init__(self, method: str = "auto", workers: Optional[int] = None):
+        self.methods = list(self.METHODS) if method == "auto" else [method, "buffered"]
+        self.workers = workers or min(32, (os.cpu_count() or 1) * 2)
+        self.disabled: set[str] = set()
+        self.lock = threading.Lock()
+        self.stats = {"files": 0, "bytes": 0}
+
+    def _record(self, method: str, size: int) -> None:
+        with self.lock:
+            self.stats["files"] += 1
+            self.stats["bytes"] += size
+            self.stats[method] = self.stats.get(method, 0) + 1
+
+    def _usable(self, method: str) -> bool:
+        return method in self.methods and method not in self.disabled
+
+    def _disable(self, method: str) -> None:
+        with self.lock:
+            self.disabled.add(method)
+
+    def _clonefile(self, src: str, dst: str) -> bool:
+        if sys.platform != "darwin" or not self._usable("clone"):
+            return False
+        libc = darwin_libc()
+        if libc.clonefile(os.fsencode(src), os.fsencode(dst), CLONE_NOFOLLOW) == 0:
+            return True
+        err = ctypes.get_errno()
+        if err in COPY_UNSUPPORTED:
+            self._disable("clone")
+            return False
+        raise OSError(err, os.strerror(err), src)
+
+    def _copy_data(self, src_fd: int, dst_fd: int, size: int) -> str:
+        for method in self.methods:
+            if method in self.disabled:
+                continue
+            offset = 0
+            try:
+                if method == "clone":
+                    if not sys.platform.startswith("linux"):
+                        continue
+                    fcntl.ioctl(dst_fd, FICLONE, src_fd)
+                    return method
+                if method == "copy_file_range":
+                    if not hasattr(os, "copy_file_range"):
+                        continue
+                    while offset < size:
+                        copied = os.copy_file_range(src_fd, dst_fd, size - offset, offset, offset)
+                        if copied == 0:
+                            break
+                        offset += copied
+                    return method
+                if method == "sendfile":
+                    if not sys.platform.startswith("linux"):
+                        continue
+                    while offset < size:
+                        copied = os.sendfile(dst_fd, src_fd, offset, size - offset)
+                        if copied == 0:
+                            break
+                        offset += copied
+                    return method
+            except OSError as exc:
+                if offset or exc.errno not in COPY_UNSUPPORTED:
+                    raise
+                self._disable(method)
+                continue
+            while True:
+                block = os.read(src_fd, COPY_BUFFER_BYTES)
+                if not block:
+                    break
+                view = memoryview(block)
+                while view:
+                    view = view[os.write(dst_fd, view):]
+            return "buffered"
+        raise OSError(errno.ENOTSUP, "no usable copy method")
+
+    def copy_file(self, src: str, dst: str) -> None:
+        src_stat = os.lstat(src)
+        if self._clonefile(src, dst):
+            self._record("clone", src_stat.st_size)
+            return
+        src_fd = os.open(src, os.O_RDONLY)
         try:
-            logger.pause_for_external()
-            run_subprocess([
-                "sudo",
-                "/bin/bash",
-                str(temp_path),
-            ], logger, "Administrator install failed", elevate=True)
+            dst_fd = os.open(dst, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            try:
+                method = self._copy_data(src_fd, dst_fd, src_stat.st_size)
+            finally:
+                os.close(dst_fd)
         finally:
-            logger.resume_after_external()
-            temp_path.unlink(missing_ok=True)
+            os.close(src_fd)
+        copy_metadata(src, dst, src_stat)
+        self._record(method, src_stat.st_size)
+
+    def copy_tree(self, src: Path, dst: Path) -> dict:
+        if self._clonefile(str(src), str(dst)):
+            self._record("clone", 0)
+            return dict(self.stats)
+        fill_tree(src, dst, self.copy_file, self.workers)
+        return dict(self.stats)
+
+
+def file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for block in iter(lambda: fh.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def remove_path(path: str) -> None:
+    if os.path.isdir(path) and not os.path.islink(path):
+        shutil.rmtree(path)
     else:
+        os.unlink(path)
+
+
+def same_file_contents(src: str, dst: str) -> bool:
+    if os.lstat(src).st_size != os.lstat(dst).st_size:
+        return False
+    with open(src, "rb", buffering=0) as first, open(dst, "rb", buffering=0) as second:
+        while True:
+            block = first.read(COPY_BUFFER_BYTES)
+            if block != second.read(COPY_BUFFER_BYTES):
+                return False
+            if not block:
+                return True
+
+
+def stage_file(src: str, live: Optional[str], dst: str, engine: CopyEngine) -> str:
+    if live and same_file_contents(src, live):
+        try:
+            os.link(live, dst, follow_symlinks=False)
+        except OSError:
+            pass
+        else:
+            return "unchanged"
+    engine.copy_file(src, dst)
+    return "copied"
+
+
+def stage_directory(
+    src: str, live: Optional[str], dst: str, stats: dict, files: list, directories: list
+) -> None:
+    with os.scandir(src) as it:
+        src_entries = {entry.name: entry for entry in it}
+    live_entries = {}
+    if live and os.path.isdir(live) and not os.path.islink(live):
+        with os.scandir(live) as it:
+            live_entries = {entry.name: entry for entry in it}
+
+    os.mkdir(dst)
+    directories.append((src, dst))
+    for name, entry in src_entries.items():
+        target = os.path.join(dst, name)
+        existing = live_entries.get(name)
+        if entry.is_symlink():
+            os.symlink(os.readlink(entry.path), target)
+            stats["unchanged" if existing and existing.is_symlink() else "copied"] += 1
+        elif entry.is_dir(follow_symlinks=False):
+            stage_directory(entry.path, existing.path if existing else None, target, stats, files, directories)
+        elif (
+            existing
+            and existing.is_file(follow_symlinks=False)
+            and stat.S_IMODE(existing.stat(follow_symlinks=False).st_mode)
+            == stat.S_IMODE(entry.stat(follow_symlinks=False).st_mode)
+        ):
+            files.append((entry.path, existing.path, target))
+        else:
+            files.append((entry.path, None, target))
+    stats["removed"] += sum(1 for name in live_entries if name not in src_entries)
+
+
+def stage_delta(bundle: Path, live: Path, staging: Path, engine: CopyEngine) -> dict:
+    stats = {"copied": 0, "removed": 0, "unchanged": 0}
+    files: list[tuple[str, Optional[str], str]] = []
+    directories: list[tuple[str, str]] = []
+    stage_directory(str(bundle), str(live), str(staging), stats, files, directories)
+    if len(files) > 1 and engine.workers > 1:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=engine.workers) as pool:
+            for future in [pool.submit(stage_file, *job, engine) for job in files]:
+                stats[future.result()] += 1
+    else:
+        for job in files:
+            stats[stage_file(*job, engine)] += 1
+    for source, target in reversed(directories):
+        copy_metadata(source, target, os.lstat(source))
+    return stats
+
+
+def full_install(bundle: Path, target: Path, engine: CopyEngine) -> dict:
+    if target.exists() or target.is_symlink():
+        remove_path(str(target))
+    return engine.copy_tree(bundle, target)
+
+
+def exchange_paths(first: Path, second: Path) -> bool:
+    try:
+        libc = ctypes.CDLL(None, use_errno=True)
+    except OSError:
+        return False
+    if sys.platform == "darwin" and hasattr(libc, "renamex_np"):
+        result = libc.renamex_np(os.fsencode(first), os.fsencode(second), ctypes.c_uint(RENAME_SWAP))
+    elif sys.platform.startswith("linux") and hasattr(libc, "renameat2"):
+        result = libc.renameat2(
+            AT_FDCWD, os.fsencode(first), AT_FDCWD, os.fsencode(second), ctypes.c_uint(RENAME_EXCHANGE)
+        )
+    else:
+        return False
+    if result == 0:
+        return True
+    err = ctypes.get_errno()
+    if err in (errno.ENOSYS, errno.EINVAL, errno.ENOTSUP, errno.EOPNOTSUPP):
+        return False
+    raise OSError(err, os.strerror(err), str(first))
+
+
+def staging_paths(target: Path, tag: Optional[str]) -> tuple[Path, Path]:
+    label = re.sub(r"[^A-Za-z0-9._-]", "_", tag or "") or "new"
+    return target.with_name(f"{target.name}.staging-{label}"), target.with_name(f"{target.name}.previous")
+
+
+def swap_into_place(staging: Path, target: Path, previous: Path) -> None:
+    if previous.exists() or previous.is_symlink():
+        remove_path(str(previous))
+    if not target.exists() and not target.is_symlink():
+        os.rename(staging, target)
+        return
+    if exchange_paths(staging, target):
+        os.rename(staging, previous)
+        return
+    os.rename(target, previous)
+    os.rename(staging, target)
+
+
+class BundleStore:
+    def __init__(
+        self,
+        root: Path,
+        engine: CopyEngine,
+        max_bytes: int = STORE_MAX_BYTES,
+        keep: int = STORE_KEEP,
+        archive_keep: int = ARCHIVE_KEEP,
+    ):
+        self.root = root
+        self.objects = root / OBJECTS_SUBDIR
+        self.archives = root / ARCHIVES_SUBDIR
+        self.archive_keep = max(1, archive_keep)
+        self.index_path = root / STORE_INDEX_NAME
+        self.engine = engine
+        self.max_bytes = max_bytes
+        self.keep = max(1, keep)
+        self.lock = threading.Lock()
+        self.stats = {"files": 0, "stored": 0, "linked": 0}
+
+    def _load_index(self) -> dict:
+        try:
+            index = json.loads(self.index_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            index = {}
+        bundles = index.get("bundles") if isinstance(index, dict) else None
+        return bundles if isinstance(bundles, dict) else {}
+
+    def _save_index(self, bundles: dict) -> None:
+        write_json_atomic(self.index_path, {"bundles": bundles})
+
+    def _object_for(self, path: str, src_stat: os.stat_result) -> Path:
+        digest = file_sha256(path)
+        obj = self.objects / digest[:2] / f"{digest}-{stat.S_IMODE(src_stat.st_mode):o}"
+        if not obj.exists():
+            obj.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = obj.with_name(f"{obj.name}.{threading.get_ident()}.tmp")
+            self.engine.copy_file(path, str(tmp_path))
+            os.replace(tmp_path, obj)
+            with self.lock:
+                self.stats["stored"] += 1
+        return obj
+
+    def _link_file(self, src: str, dst: str) -> None:
+        obj = self._object_for(src, os.lstat(src))
+        try:
+            os.link(obj, dst)
+        except OSError as exc:
+            if exc.errno != errno.EMLINK:
+                raise
+            self.engine.copy_file(src, dst)
+        else:
+            with self.lock:
+                self.stats["linked"] += 1
+        with self.lock:
+            self.stats["files"] += 1
+
+    def add(self, bundle: Path, name: str, digest: Optional[str] = None) -> dict:
+        self.stats = {"files": 0, "stored": 0, "linked": 0}
+        self.root.mkdir(parents=True, exist_ok=True)
+        target = self.root / name
+        building = target.with_name(target.name + ".tmp")
+        if building.exists() or building.is_symlink():
+            remove_path(str(building))
+        fill_tree(bundle, building, self._link_file, self.engine.workers)
+        if target.exists() or target.is_symlink():
+            remove_path(str(target))
+        os.rename(building, target)
+
+        bundles = self._load_index()
+        bundles[name] = {"added_at": timestamp(), "last_used": time.time(), "sha256": digest}
+        self._save_index(bundles)
+        return dict(self.stats)
+
+    def holds(self, name: str, digest: Optional[str]) -> bool:
+        entry = self._load_index().get(name)
+        return bool(digest) and isinstance(entry, dict) and entry.get("sha256") == digest and (self.root / name).is_dir()
+
+    def touch(self, name: str) -> None:
+        bundles = self._load_index()
+        if name in bundles:
+            bundles[name]["last_used"] = time.time()
+            self._save_index(bundles)
+
+    def usage(self) -> int:
+        total = 0
+        for root in (self.objects, self.archives):
+            for directory, _, names in os.walk(root):
+                for name in names:
+                    with contextlib.suppress(OSError):
+                        total += os.lstat(os.path.join(directory, name)).st_size
+        return total
+
+    def logical_size(self, bundles: dict) -> int:
+        total = 0
+        for name in bundles:
+            for directory, _, names in os.walk(self.root / name):
+                for entry in names:
+                    entry_stat = os.lstat(os.path.join(directory, entry))
+                    if stat.S_ISREG(entry_stat.st_mode):
+                        total += entry_stat.st_size
+        return total
+
+    def prune_objects(self) -> int:
+        freed = 0
+        for directory, _, names in os.walk(self.objects):
+            for name in names:
+                path = os.path.join(directory, name)
+                with contextlib.suppress(OSError):
+                    object_stat = os.lstat(path)
+                    if object_stat.st_nlink <= 1:
+                        os.unlink(path)
+                        freed += object_stat.st_size
+        return freed
+
+    def remove_archive(self, archive: Path) -> int:
+        freed = 0
+        for path in (archive, digest_path(archive), *partial_paths(archive)):
+            with contextlib.suppress(OSError):
+                size = path.stat().st_size
+                path.unlink()
+                freed += size
+        return freed
+
+    def archive_entries(self) -> tuple[list[tuple[float, Path]], list[Path]]:
+        archives = []
+        leftovers = []
+        if not self.archives.is_dir():
+            return archives, leftovers
+        for entry in os.scandir(self.archives):
+            if not entry.is_file(follow_symlinks=False):
+                continue
+            if MIRROR_ARCHIVE_RE.fullmatch(entry.name):
+                archives.append((entry.stat().st_mtime, Path(entry.path)))
+            else:
+                leftovers.append(Path(entry.path))
+        archives.sort(key=lambda item: item[0], reverse=True)
+        return archives, leftovers
+
+    def prune_archives(self, current: Optional[Path] = None) -> tuple[list[str], int]:
+        archives, leftovers = self.archive_entries()
+        kept = {current.name} if current else set()
+        evicted = []
+        freed = 0
+        for _, archive in archives:
+            if archive.name in kept:
+                continue
+            if len(kept) < self.archive_keep:
+                kept.add(archive.name)
+                continue
+            freed += self.remove_archive(archive)
+            evicted.append(archive.name)
+        cutoff = time.time() - PARTIAL_MAX_AGE_SECONDS
+        for path in leftovers:
+            base = path.name.split(".sha256")[0].split(PARTIAL_SUFFIX)[0]
+            if base in kept or (self.archives / base).exists():
+                continue
+            with contextlib.suppress(OSError):
+                path_stat = path.stat()
+                if path.name.endswith(".sha256") or path_stat.st_mtime < cutoff:
+                    path.unlink()
+                    freed += path_stat.st_size
+        return evicted, freed
+
+    def gc(self, current_archive: Optional[Path] = None) -> dict:
+        archives_evicted, archives_freed = self.prune_archives(current_archive)
+        bundles = self._load_index()
+        if self.root.is_dir():
+            for entry in self.root.iterdir():
+                if entry.suffix == ".app" and entry.is_dir() and entry.name not in bundles:
+                    bundles[entry.name] = {"added_at": None, "last_used": entry.stat().st_mtime}
+        bundles = {name: info for name, info in bundles.items() if (self.root / name).is_dir()}
+        order = sorted(bundles, key=lambda name: bundles[name].get("last_used") or 0, reverse=True)
+        archives = [
+            (mtime, archive)
+            for mtime, archive in self.archive_entries()[0]
+            if current_archive is None or archive.name != current_archive.name
+        ]
+        evicted = []
+        freed = self.prune_objects()
+        while len(order) > 1 and (len(order) > self.keep or self.usage() > self.max_bytes):
+            oldest_bundle = bundles[order[-1]].get("last_used") or 0
+            if len(order) <= self.keep and archives and archives[-1][0] < oldest_bundle:
+                _, archive = archives.pop()
+                freed += self.remove_archive(archive)
+                archives_evicted.append(archive.name)
+                continue
+            name = order.pop()
+            shutil.rmtree(self.root / name, ignore_errors=True)
+            bundles.pop(name, None)
+            evicted.append(name)
+            freed += self.prune_objects()
+        while archives and self.usage() > self.max_bytes:
+            _, archive = archives.pop()
+            freed += self.remove_archive(archive)
+            archives_evicted.append(archive.name)
+        if self.root.is_dir():
+            self._save_index(bundles)
+        used = self.usage()
+        return {
+            "bundles": len(bundles),
+            "evicted": evicted,
+            "archives_evicted": archives_evicted,
+            "freed_bytes": freed + archives_freed,
+            "used_bytes": used,
+            "saved_bytes": max(0, self.logical_size(bundles) - used),
+        }
+
+
+def log_store_summary(summary: dict, logger: Logger, strings: dict) -> None:
+    for name in summary["archives_evicted"]:
+        logger.log(strings["archive_evicted"].format(name=name))
+    for name in summary["evicted"]:
+        logger.log(strings["store_evicted"].format(name=name))
+    logger.log(strings["store_summary"].format(
+        bundles=summary["bundles"],
+        used=summary["used_bytes"] / (1024 * 1024),
+        saved=summary["saved_bytes"] / (1024 * 1024),
+    ))
+
+
+def install_bundle_local(
+    bundle: Path,
+    target: Path,
+    logger: Logger,
+    strings: dict,
+    mode: str,
+    tag: Optional[str] = None,
+    copy_method: str = "auto",
+    tracer: Optional[Tracer] = None,
+) -> None:
+    tracer = tracer or Tracer()
+    target.parent.mkdir(parents=True, exist_ok=True)
+    engine = CopyEngine(copy_method)
+    staging, previous = staging_paths(target, tag)
+    if staging.exists() or staging.is_symlink():
+        remove_path(str(staging))
+    staged = False
+    if mode == "delta" and target.is_dir() and not target.is_symlink():
+        try:
+            with tracer.span("stage_delta") as span:
+                stats = stage_delta(bundle, target, staging, engine)
+                span.update(stats)
+            logger.log(strings["delta_install_summary"].format(**stats))
+            staged = True
+        except (OSError, shutil.Error) as exc:
+            logger.log(f"Delta install failed, falling back to a full copy: {exc}")
+            shutil.rmtree(staging, ignore_errors=True)
+    if not staged:
+        with tracer.span("stage_full") as span:
+            span.update(full_install(bundle, staging, engine))
+    try:
+        with tracer.span("swap"):
+            swap_into_place(staging, target, previous)
+    except OSError:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+
+
+def link_file(src: str, dst: str) -> None:
+    os.link(src, dst, follow_symlinks=False)
+
+
+def bundle_version(bundle: Path) -> str:
+    try:
+        with open(bundle / "Contents" / "Info.plist", "rb") as fh:
+            info = plistlib.load(fh)
+    except (OSError, ValueError, plistlib.InvalidFileException):
+        return "unknown"
+    if not isinstance(info, dict):
+        return "unknown"
+    return str(info.get("CFBundleShortVersionString") or info.get("CFBundleVersion") or "unknown")
+
+
+def snapshot_dir(snapshots_root: Path, target: Path) -> Path:
+    return snapshots_root / hashlib.sha256(os.path.abspath(target).encode("utf-8")).hexdigest()[:16]
+
+
+def list_snapshots(snapshots_root: Path, target: Path) -> list[Path]:
+    directory = snapshot_dir(snapshots_root, target)
+    if not directory.is_dir():
+        return []
+    return sorted(
+        (entry for entry in directory.iterdir() if (entry / SNAPSHOT_MANIFEST_NAME).is_file()),
+        key=lambda entry: entry.name,
+        reverse=True,
+    )
+
+
+def snapshot_bundle(target: Path, snapshots_root: Path, engine: CopyEngine, keep: int = SNAPSHOT_KEEP) -> Optional[Path]:
+    if keep < 1 or not target.is_dir() or target.is_symlink():
+        return None
+    now = time.time_ns()
+    stamp = time.strftime("%Y%m%dT%H%M%S", time.gmtime(now // 10**9))
+    directory = snapshot_dir(snapshots_root, target) / f"{stamp}-{now % 10**9:09d}"
+    directory.mkdir(parents=True)
+    snapshot = directory / target.name
+    try:
+        try:
+            fill_tree(target, snapshot, link_file)
+        except OSError:
+            shutil.rmtree(snapshot, ignore_errors=True)
+            engine.copy_tree(target, snapshot)
+        (directory / SNAPSHOT_MANIFEST_NAME).write_text(json.dumps({
+            "target": str(target),
+            "version": bundle_version(snapshot),
+            "created_at": timestamp(),
+        }), encoding="utf-8")
+    except BaseException:
+        shutil.rmtree(directory, ignore_errors=True)
+        raise
+    for stale in list_snapshots(snapshots_root, target)[keep:]:
+        shutil.rmtree(stale, ignore_errors=True)
+    return snapshot
+
+
+def restore_snapshot(snapshots_root: Path, target: Path, copy_method: str = "auto") -> Optional[str]:
+    snapshots = list_snapshots(snapshots_root, target)
+    if not snapshots:
+        return None
+    directory = snapshots[0]
+    manifest = json.loads((directory / SNAPSHOT_MANIFEST_NAME).read_text(encoding="utf-8"))
+    snapshot = directory / target.name
+    staging, previous = staging_paths(target, "rollback")
+    try:
+        swap_into_place(snapshot, target, previous)
+    except OSError as exc:
+        if exc.errno != errno.EXDEV:
+            raise
+        if staging.exists() or staging.is_symlink():
+            remove_path(str(staging))
+        CopyEngine(copy_method).copy_tree(snapshot, staging)
+        swap_into_place(staging, target, previous)
+    shutil.rmtree(directory, ignore_errors=True)
+    return manifest.get("version") or "unknown"
+
+
+def rollback_targets(snapshots_root: Path, targets: list[Path], logger: Logger, strings: dict, copy_method: str) -> list[dict]:
+    reports = []
+    for target in targets:
+        started = time.perf_counter()
+        report = {"target": str(target), "ok": True, "seconds": 0.0, "error": None, "privileged": False}
+        try:
+            version = restore_snapshot(snapshots_root, target, copy_method)
+        except (OSError, ValueError) as exc:
+            report.update(ok=False, error=f"Rollback failed: {exc}")
+        else:
+            if version is None:
+                logger.log(strings["rollback_missing"].format(path=target))
+                report.update(ok=False, error=strings["rollback_missing"].format(path=target))
+            else:
+                logger.log(strings["rollback_done"].format(path=target, version=version))
+                report["version"] = version
+        report["seconds"] = round(time.perf_counter() - started, 6)
+        reports.append(report)
+    return reports
+
+
+def rollback_bundle(snapshots_root: Path, targets: list[Path], logger: Logger, strings: dict, copy_method: str) -> list[dict]:
+    privileged = [target for target in targets if needs_privilege(target)]
+    local = [target for target in targets if not needs_privilege(target)]
+    reports = {}
+    for target in privileged:
+        if not list_snapshots(snapshots_root, target):
+            logger.log(strings["rollback_missing"].format(path=target))
+            reports[str(target)] = {
+                "target": str(target),
+                "ok": False,
+                "seconds": 0.0,
+                "error": "No rollback snapshot",
+                "privileged": True,
+            }
+    privileged = [target for target in privileged if str(target) not in reports]
+    if privileged:
+        arguments = ["--apply-rollback", str(snapshots_root), "--copy-method", copy_method]
+        for report in run_privileged(arguments, privileged, logger, strings):
+            reports[report["target"]] = report
+    for report in rollback_targets(snapshots_root, local, logger, strings, copy_method):
+        reports[report["target"]] = report
+    return [reports[str(target)] for target in targets]
+
+
+def needs_privilege(target: Path) -> bool:
+    return not str(target).startswith(str(Path.home()))
+
+
+def install_targets_local(
+    bundle: Path,
+    targets: list[Path],
+    logger: Logger,
+    strings: dict,
+    mode: str = "delta",
+    tag: Optional[str] = None,
+    copy_method: str = "auto",
+    workers: int = 1,
+    tracer: Optional[Tracer] = None,
+) -> list[dict]:
+    tracer = tracer or Tracer()
+
+    def install_one(target: Path) -> dict:
+        logger.log(strings["install_prepare"].format(path=target))
+        started = time.perf_counter()
+        report = {"target": str(target), "ok": True, "seconds": 0.0, "error": None, "privileged": False}
         try:
-            do_install()
-        except subprocess.CalledProcessError as exc:
-            raise UpdaterError("Installation failed") from exc
+            with tracer.span("install_target", target=str(target)):
+                install_bundle_local(bundle, target, logger, strings, mode, tag, copy_method, tracer)
+        except OSError as exc:
+            report["ok"] = False
+            report["error"] = f"Installation failed: {exc}"
+        report["seconds"] = round(time.perf_counter() - started, 6)
+        return report
+
+    if len(targets) == 1:
+        return [install_one(targets[0])]
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max(1, min(workers, len(targets)))) as pool:
+        return list(pool.map(install_one, targets))
+
+
+def install_targets_privileged(
+    bundle: Path,
+    targets: list[Path],
+    logger: Logger,
+    strings: dict,
+    mode: str = "delta",
+    tag: Optional[str] = None,
+    copy_method: str = "auto",
+    workers: int = 1,
+) -> list[dict]:
+    return run_privileged(
+        [
+            "--apply-install",
+            str(bundle),
+            "--install-mode",
+            mode,
+            "--install-workers",
+            str(workers),
+            "--tag",
+            tag or "",
+            "--copy-method",
+            copy_method,
+        ],
+        targets,
+        logger,
+        strings,
+    )
+
+
+def run_privileged(arguments: list[str], targets: list[Path], logger: Logger, strings: dict) -> list[dict]:
+    logger.log(strings["requires_admin"])
+    fd, report_name = tempfile.mkstemp(prefix="launchnext-install-", suffix=".json")
+    os.close(fd)
+    report_path = Path(report_name)
+    command = ["sudo", sys.executable, str(Path(__file__).resolve()), *arguments, "--apply-report", str(report_path)]
+    for target in targets:
+        command += ["--install-dir", str(target)]
+    command += ["--language", strings_language(strings)]
+    started = time.perf_counter()
+    try:
+        logger.pause_for_external()
+        try:
+            subprocess.run(command, check=False)
+        finally:
+            logger.resume_after_external()
+        reports = json.loads(report_path.read_text(encoding="utf-8") or "[]")
+    except (OSError, ValueError) as exc:
+        logger.log(f"Administrator install failed: {exc}")
+        reports = []
+    finally:
+        report_path.unlink(missing_ok=True)
+    by_target = {report.get("target"): report for report in reports if isinstance(report, dict)}
+    results = []
+    for target in targets:
+        report = by_target.get(str(target)) or {
+            "target": str(target),
+            "ok": False,
+            "error": "Administrator install failed",
+            "seconds": round(time.perf_counter() - started, 6),
+        }
+        results.append({**report, "privileged": True})
+    return results
+
+
+def install_bundle(
+    bundle: Path,
+    targets: list[Path],
+    logger: Logger,
+    strings: dict,
+    mode: str = "delta",
+    tag: Optional[str] = None,
+    copy_method: str = "auto",
+    workers: int = 1,
+    tracer: Optional[Tracer] = None,
+) -> list[dict]:
+    privileged = [target for target in targets if needs_privilege(target)]
+    local = [target for target in targets if not needs_privilege(target)]
+    reports = {}
+    if privileged:
+        for target in privileged:
+            logger.log(strings["install_prepare"].format(path=target))
+        for report in install_targets_privileged(bundle, privileged, logger, strings, mode, tag, copy_method, workers):
+            reports[report["target"]] = report
+    if local:
+        for report in install_targets_local(bundle, local, logger, strings, mode, tag, copy_method, workers, tracer):
+            reports[report["target"]] = report
+    return [reports[str(target)] for target in targets]
+
+
+def read_install_manifest(path: Path) -> list[str]:
+    text = path.read_text(encoding="utf-8")
+    if text.lstrip().startswith("["):
+        entries = json.loads(text)
+        if not isinstance(entries, list) or not all(isinstance(entry, str) for entry in entries):
+            raise ValueError("manifest must be a JSON list of paths")
+        return entries
+    return [
+        line.strip()
+        for line in text.splitlines()
+        if line.strip() and not line.strip().startswith("#")
+    ]
+
+
+def resolve_install_dirs(args) -> list[Path]:
+    entries = list(args.install_dir or [])
+    if args.install_manifest:
+        entries += read_install_manifest(Path(args.install_manifest).expanduser())
+    targets: list[Path] = []
+    seen = set()
+    for entry in entries or [DEFAULT_INSTALL]:
+        target = Path(entry).expanduser()
+        key = os.path.abspath(target)
+        if key not in seen:
+            seen.add(key)
+            targets.append(target)
+    return targets
+
+
+def prepare_bundle(
+    args,
+    asset: dict,
+    asset_url: str,
+    expected_size: Optional[int],
+    downloads_dir: Path,
+    extract_dir: Path,
+    logger: Logger,
+    strings: dict,
+    display=None,
+    tracer: Optional[Tracer] = None,
+) -> tuple[Path, Optional[str], Optional[str]]:
+    tracer = tracer or Tracer()
+    archive_path = archive_store_path(downloads_dir, asset)
+    expected_sha256 = expected_digest(asset, args.sha256)
+    archive_digest = None
+    if archive_is_cached(archive_path, expected_size):
+        archive_digest = cached_archive_digest(archive_path)
+        if expected_sha256 and archive_digest != expected_sha256:
+            archive_digest = None
+
+    sources = [asset_url]
+    if args.mirror and not archive_digest:
+        if expected_sha256:
+            logger.log(strings["mirror_used"].format(url=args.mirror))
+            sources.insert(0, mirror_archive_url(args.mirror, asset))
+        else:
+            logger.log("Skipping the mirror archive: no SHA-256 from GitHub or --sha256 to verify it against")
+    for source in sources:
+        shutil.rmtree(extract_dir, ignore_errors=True)
+        extract_dir.mkdir(parents=True, exist_ok=True)
+        with ArchivePipeline(partial_paths(archive_path)[0], expected_size, extract_dir, tracer) as pipeline:
+            if archive_digest:
+                logger.log(strings["archive_cached"].format(path=archive_path))
+                with contextlib.suppress(OSError):
+                    os.utime(archive_path)
+            else:
+                logger.log(strings["downloading"])
+                progress_cb = None
+                if display and hasattr(display, "update_progress"):
+                    label = strings.get("downloading", "Downloading...")
+
+                    def _progress(current: int, total: Optional[int]) -> None:
+                        display.update_progress(label, current, total)
+
+                    progress_cb = _progress
+                try:
+                    if not expected_sha256:
+                        with tracer.span("central_directory", url=source) as span:
+                            span["from_tail"] = pipeline.load_directory_from_url(source)
+                    with tracer.span("download", connections=max(1, args.connections)) as span:
+                        span["bytes"], archive_digest = download_asset(
+                            source,
+                            archive_path,
+                            logger,
+                            strings,
+                            progress_callback=progress_cb,
+                            expected_size=expected_size,
+                            connections=max(1, args.connections),
+                            expected_sha256=expected_sha256,
+                            data_callback=None if expected_sha256 else pipeline.data_received,
+                        )
+                except (UpdaterError, OSError, http.client.HTTPException) as exc:
+                    pipeline.close()
+                    shutil.rmtree(extract_dir, ignore_errors=True)
+                    if source == sources[-1]:
+                        raise
+                    logger.log(strings["mirror_fallback"].format(error=exc))
+                    continue
+                finally:
+                    if display and hasattr(display, "clear_progress"):
+                        display.clear_progress()
+            if expected_sha256:
+                logger.log(strings["sha256_verified"].format(digest=archive_digest))
+            else:
+                logger.log(strings["sha256_unverified"].format(digest=archive_digest))
+
+            logger.log(strings["extracting"])
+            progress_cb = None
+            if display and hasattr(display, "update_progress"):
+                label = strings.get("extracting", "Extracting...")
+
+                def _progress(current: int, total: Optional[int]) -> None:
+                    display.update_progress(label, current, total)
+
+                progress_cb = _progress
+            try:
+                with tracer.span("extract_finish", bytes=archive_path.stat().st_size):
+                    pipeline.finish(archive_path, progress_cb)
+                app_bundle = pipeline.bundle_path
+            except (OSError, zipfile.BadZipFile, MissingRange) as exc:
+                logger.log(f"Streaming extraction failed: {exc}")
+                shutil.rmtree(extract_dir, ignore_errors=True)
+                extract_dir.mkdir(parents=True, exist_ok=True)
+                try:
+                    with tracer.span("extract_archive"):
+                        app_bundle = extract_archive(archive_path, extract_dir, progress_cb)
+                except (OSError, zipfile.BadZipFile) as exc:
+                    logger.log(f"Failed to extract archive: {exc}")
+                    archive_path.unlink(missing_ok=True)
+                    digest_path(archive_path).unlink(missing_ok=True)
+                    raise UpdaterError("Failed to extract archive") from exc
+            finally:
+                if display and hasattr(display, "clear_progress"):
+                    display.clear_progress()
+        break
+
+    if app_bundle is None or not app_bundle.is_dir():
+        raise UpdaterError("Archive does not contain a .app bundle")
+    logger.log(strings["found_bundle"].format(path=app_bundle))
+
+    with tracer.span("prune_archives") as span:
+        store = BundleStore(downloads_dir, CopyEngine(args.copy_method), archive_keep=args.archive_keep)
+        evicted, span["freed_bytes"] = store.prune_archives(archive_path)
+        span["evicted"] = len(evicted)
+    for name in evicted:
+        logger.log(strings["archive_evicted"].format(name=name))
+
+    with tracer.span("remove_quarantine") as span:
+        report = remove_quarantine(app_bundle, logger, strings)
+        span["files"] = report["files"]
+        span["removed"] = report["removed"]
+        span["failures"] = len(report["failures"])
+    return app_bundle, archive_digest, expected_sha256
+
+
+def api_headers() -> dict:
+    headers = {"Accept": "application/vnd.github+json"}
+    token = os.environ.get("GITHUB_TOKEN")
+    if token:
+        headers["Authorization"] = f"Bearer {token}"
+    return headers
 
 
-def emit_json(stage: str, message: str, elapsed: float) -> None:
+def load_staged(base_dir: Path) -> dict:
+    try:
+        data = json.loads((base_dir / STAGED_SUBDIR / STAGED_MANIFEST_NAME).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def staged_bundle(base_dir: Path, asset: dict, expected_sha256: Optional[str]) -> Optional[dict]:
+    staged = load_staged(base_dir)
+    if staged.get("key") != archive_key(asset):
+        return None
+    if expected_sha256 and staged.get("sha256") != expected_sha256:
+        return None
+    if not Path(staged.get("bundle") or "").is_dir():
+        return None
+    return staged
+
+
+def stage_bundle(base_dir: Path, bundle: Path, asset: dict, tag: str, digest: Optional[str], verified: bool) -> Path:
+    root = base_dir / STAGED_SUBDIR
+    manifest_path = root / STAGED_MANIFEST_NAME
+    with contextlib.suppress(FileNotFoundError):
+        manifest_path.unlink()
+    key = archive_key(asset)
+    for entry in root.iterdir() if root.is_dir() else []:
+        if entry.is_dir():
+            shutil.rmtree(entry, ignore_errors=True)
+    target = root / key / bundle.name
+    target.parent.mkdir(parents=True, exist_ok=True)
+    shutil.move(str(bundle), str(target))
+    write_json_atomic(manifest_path, {
+        "key": key,
+        "tag": tag,
+        "bundle": str(target),
+        "sha256": digest,
+        "verified": verified,
+        "staged_at": timestamp(),
+    })
+    return target
+
+
+def mark_installed(base_dir: Path, asset: dict, tag: str) -> None:
+    root = base_dir / STAGED_SUBDIR
+    shutil.rmtree(root, ignore_errors=True)
+    root.mkdir(parents=True, exist_ok=True)
+    (root / STAGED_MANIFEST_NAME).write_text(json.dumps({
+        "installed": archive_key(asset),
+        "tag": tag,
+        "installed_at": timestamp(),
+    }), encoding="utf-8")
+
+
+def emit_json(stage: str, message: str, elapsed: float, **extra) -> None:
     print(json.dumps({
         "stage": stage,
         "message": message,
         "elapsed_seconds": elapsed,
+        **extra,
     }))
 
 
 def execute_update(
     args,
     strings: dict,
-    install_dir: Path,
+    install_dirs: list[Path],
     download_only: bool,
     logger: Logger,
     base_dir: Path,
@@ -842,27 +3282,22 @@ def execute_update(
     hold_callback=None,
     allow_manual_choice: bool = True,
     display=None,
+    tracer: Optional[Tracer] = None,
 ) -> int:
-    headers = {"Accept": "application/vnd.github+json"}
-    token = os.environ.get("GITHUB_TOKEN")
-    if token:
-        headers["Authorization"] = f"Bearer {token}"
+    tracer = tracer or Tracer()
 
     start_time = datetime.now()
+    target_reports: list[dict] = []
+    if args.mirror:
+        HTTP.set_timeout(args.mirror, MIRROR_TIMEOUT_SECONDS)
 
     try:
-        api_url = (
-            f"https://api.github.com/repos/{REPO_OWNER}/{REPO_NAME}/releases/tags/{args.tag}"
-            if args.tag
-            else f"https://api.github.com/repos/{REPO_OWNER}/{REPO_NAME}/releases/latest"
-        )
-        logger.log(strings["fetching"].format(url=api_url))
-        metadata = fetch_release_metadata(args.tag, headers)
+        metadata = resolve_release(args, base_dir, logger, strings, tracer)
         release_tag = metadata.get("tag_name", "unknown")
         release_url = metadata.get("html_url", "")
         logger.log(strings["latest_tag"].format(tag=release_tag))
 
-        asset_name, asset_url, asset_size, release_tag, release_url = select_asset(
+        asset_name, asset_url, asset_size, release_tag, release_url, asset = select_asset(
             metadata,
             args.asset_pattern,
             strings,
@@ -871,78 +3306,111 @@ def execute_update(
         logger.log(strings["asset_selected"].format(name=asset_name, size=asset_size))
         expected_size = asset_size or None
 
-        with tempfile.TemporaryDirectory() as tmp_dir_str:
-            tmp_dir = Path(tmp_dir_str)
-            archive_path = tmp_dir / asset_name
-            logger.log(strings["downloading"])
-            progress_cb = None
-            if display and hasattr(display, "update_progress"):
-                label = strings.get("downloading", "Downloading...")
-
-                def _progress(current: int, total: Optional[int]) -> None:
-                    display.update_progress(label, current, total)
-
-                progress_cb = _progress
-            download_asset(
-                asset_url,
-                archive_path,
-                logger,
-                strings,
-                progress_callback=progress_cb,
-                expected_size=expected_size,
-            )
-            if display and hasattr(display, "clear_progress"):
-                display.clear_progress()
+        downloads_dir = base_dir / DOWNLOADS_SUBDIR
+        downloads_dir.mkdir(parents=True, exist_ok=True)
+        staged = staged_bundle(base_dir, asset, expected_digest(asset, args.sha256))
 
-            logger.log(strings["extracting"])
-            extract_dir = tmp_dir / "extracted"
-            extract_dir.mkdir(parents=True, exist_ok=True)
-            run_subprocess([
-                "ditto",
-                "-x",
-                "-k",
-                str(archive_path),
-                str(extract_dir),
-            ], logger, "Failed to extract archive")
-
-            app_candidates = list(extract_dir.rglob("*.app"))
-            if not app_candidates:
-                raise UpdaterError("Archive does not contain a .app bundle")
-            app_bundle = app_candidates[0]
-            logger.log(strings["found_bundle"].format(path=app_bundle))
-
-            remove_quarantine(app_bundle, logger, strings)
-
-            downloads_dir = base_dir / DOWNLOADS_SUBDIR
-            downloads_dir.mkdir(parents=True, exist_ok=True)
+        with tempfile.TemporaryDirectory() as tmp_dir_str:
+            if staged:
+                app_bundle = Path(staged["bundle"])
+                archive_digest = staged.get("sha256")
+                expected_sha256 = archive_digest if staged.get("verified") else None
+                logger.log(strings["staged_used"].format(path=app_bundle))
+            else:
+                app_bundle, archive_digest, expected_sha256 = prepare_bundle(
+                    args,
+                    asset,
+                    asset_url,
+                    expected_size,
+                    downloads_dir,
+                    Path(tmp_dir_str) / "extracted",
+                    logger,
+                    strings,
+                    display,
+                    tracer,
+                )
 
             if download_only:
+                store = BundleStore(
+                    downloads_dir,
+                    CopyEngine(args.copy_method),
+                    args.store_max_bytes,
+                    args.store_keep,
+                    args.archive_keep,
+                )
                 target_copy = downloads_dir / f"{asset_name.rstrip('.zip')}.app"
-                if target_copy.exists():
-                    shutil.rmtree(target_copy)
-                run_subprocess([
-                    "ditto",
-                    "--rsrc",
-                    "--preserveHFSCompression",
-                    str(app_bundle),
-                    str(target_copy),
-                ], logger, "Failed to copy bundle to downloads directory")
+                try:
+                    with tracer.span("copy_download_only") as span:
+                        if store.holds(target_copy.name, archive_digest):
+                            store.touch(target_copy.name)
+                        else:
+                            span.update(store.add(app_bundle, target_copy.name, archive_digest))
+                    with tracer.span("store_gc"):
+                        log_store_summary(store.gc(archive_store_path(downloads_dir, asset)), logger, strings)
+                except OSError as exc:
+                    logger.log(f"Failed to copy bundle to downloads directory: {exc}")
+                    raise UpdaterError("Failed to copy bundle to downloads directory") from exc
                 logger.log(strings["download_only_path"].format(path=target_copy))
                 message = strings["download_only_path"].format(path=target_copy)
             else:
-                install_bundle(app_bundle, install_dir, logger, strings)
+                snapshots_root = base_dir / SNAPSHOTS_SUBDIR
+                for target in install_dirs:
+                    try:
+                        with tracer.span("snapshot", target=str(target)):
+                            snapshot = snapshot_bundle(target, snapshots_root, CopyEngine(args.copy_method), args.snapshot_keep)
+                    except OSError as exc:
+                        logger.log(f"Could not snapshot {target} for rollback: {exc}")
+                    else:
+                        if snapshot:
+                            logger.log(strings["snapshot_saved"].format(path=target))
+                with tracer.span("install", mode=args.install_mode, targets=len(install_dirs)):
+                    target_reports = install_bundle(
+                        app_bundle,
+                        install_dirs,
+                        logger,
+                        strings,
+                        args.install_mode,
+                        release_tag,
+                        args.copy_method,
+                        args.install_workers,
+                        tracer,
+                    )
+                failed = [report for report in target_reports if not report["ok"]]
+                if len(target_reports) > 1:
+                    for report in failed:
+                        logger.log(strings["fleet_target_failed"].format(path=report["target"], error=report["error"]))
+                    logger.log(strings["fleet_install_summary"].format(
+                        ok=len(target_reports) - len(failed),
+                        total=len(target_reports),
+                    ))
+                if failed:
+                    if len(target_reports) == 1:
+                        raise UpdaterError(failed[0]["error"])
+                    raise UpdaterError(f"Installation failed for {len(failed)} of {len(target_reports)} targets")
+                mark_installed(base_dir, asset, release_tag)
                 message = strings["update_complete"].format(tag=release_tag)
                 logger.log(strings["install_complete"])
                 if release_url:
                     logger.log(strings["release_notes"].format(url=release_url))
-                if subprocess.run(["open", str(install_dir)], check=False).returncode != 0:
-                    logger.log(strings["relaunch_warn"])
+                if len(install_dirs) == 1:
+                    with tracer.span("relaunch"):
+                        relaunched = subprocess.run(["open", str(install_dirs[0])], check=False).returncode == 0
+                    if not relaunched:
+                        logger.log(strings["relaunch_warn"])
 
         elapsed = (datetime.now() - start_time).total_seconds()
         logger.log(strings["update_elapsed"].format(seconds=int(elapsed)))
 
         if args.emit_json:
-            emit_json("Finished", message, elapsed)
+            emit_json(
+                "Finished",
+                message,
+                elapsed,
+                sha256=archive_digest,
+                sha256_verified=bool(expected_sha256),
+                stages=tracer.summary(),
+                targets=target_reports,
+            )
         if hold_window:
             if hold_callback:
                 hold_callback(strings["press_enter"])
@@ -955,7 +3423,7 @@ def execute_update(
             display.clear_progress()
         logger.log(f"ERROR: {err}")
         if args.emit_json:
-            emit_json("Failed", str(err), (datetime.now() - start_time).total_seconds())
+            emit_json("Failed", str(err), (datetime.now() - start_time).total_seconds(), targets=target_reports)
         if hold_window:
             if hold_callback:
                 hold_callback(strings["press_enter"])
@@ -964,24 +3432,302 @@ def execute_update(
         return 1
 
 
-def main() -> int:
-    parser = argparse.ArgumentParser(description="LaunchNext updater")
-    parser.add_argument("--tag")
-    parser.add_argument("--asset-pattern", default=DEFAULT_PATTERN)
-    parser.add_argument("--install-dir")
-    parser.add_argument("--download-only", action="store_true")
-    parser.add_argument("--emit-json", action="store_true")
-    parser.add_argument("--yes", action="store_true", help="Run without prompts")
-    parser.add_argument("--language", choices=list(STRINGS.keys()))
-    parser.add_argument("--reset-language", action="store_true")
-    parser.add_argument("--hold-window", action="store_true")
-    args = parser.parse_args()
+def lower_priority(logger: Logger) -> None:
+    try:
+        os.nice(PREFETCH_NICE)
+    except OSError as exc:
+        logger.log(f"Could not lower CPU priority: {exc}")
+    libc = ctypes.CDLL(None, use_errno=True)
+    if sys.platform == "darwin":
+        result = libc.setiopolicy_np(IOPOL_TYPE_DISK, IOPOL_SCOPE_PROCESS, IOPOL_THROTTLE)
+    else:
+        number = IOPRIO_SET_SYSCALLS.get(os.uname().machine)
+        result = libc.syscall(number, IOPRIO_WHO_PROCESS, 0, IOPRIO_IDLE) if number else -1
+    if result != 0:
+        logger.log(f"Could not lower I/O priority: {os.strerror(ctypes.get_errno())}")
+
+
+def prefetch_release(args, base_dir: Path, logger: Logger, strings: dict, tracer: Tracer) -> Optional[Path]:
+    metadata = resolve_release(args, base_dir, logger, strings, tracer)
+    asset_name, asset_url, asset_size, release_tag, _, asset = select_asset(metadata, args.asset_pattern, strings, False)
+    if (
+        load_staged(base_dir).get("installed") == archive_key(asset)
+        or staged_bundle(base_dir, asset, expected_digest(asset, args.sha256))
+    ):
+        logger.log(strings["prefetch_current"].format(tag=release_tag))
+        return None
+    logger.log(strings["asset_selected"].format(name=asset_name, size=asset_size))
+    downloads_dir = base_dir / DOWNLOADS_SUBDIR
+    downloads_dir.mkdir(parents=True, exist_ok=True)
+    with tempfile.TemporaryDirectory(dir=base_dir) as tmp_dir_str:
+        app_bundle, archive_digest, expected_sha256 = prepare_bundle(
+            args,
+            asset,
+            asset_url,
+            asset_size or None,
+            downloads_dir,
+            Path(tmp_dir_str) / "extracted",
+            logger,
+            strings,
+            tracer=tracer,
+        )
+        with tracer.span("stage_prefetch"):
+            staged = stage_bundle(base_dir, app_bundle, asset, release_tag, archive_digest, bool(expected_sha256))
+    logger.log(strings["prefetch_staged"].format(tag=release_tag, path=staged))
+    return staged
 
-    base_dir = Path.home() / "Library" / "Application Support" / "LaunchNext" / "updates"
+
+def run_prefetch(args, base_dir: Path, logger: Logger, strings: dict, tracer: Tracer) -> int:
+    lower_priority(logger)
+    if args.mirror:
+        HTTP.set_timeout(args.mirror, MIRROR_TIMEOUT_SECONDS)
+    while True:
+        try:
+            with tracer.span("prefetch"):
+                prefetch_release(args, base_dir, logger, strings, tracer)
+            code = 0
+        except (UpdaterError, OSError, ValueError, http.client.HTTPException) as exc:
+            logger.log(strings["prefetch_failed"].format(error=exc))
+            code = 1
+        if not args.daemon:
+            return code
+        delay = args.poll_interval * random.uniform(1 - PREFETCH_JITTER, 1 + PREFETCH_JITTER)
+        logger.log(strings["prefetch_next"].format(minutes=max(1, round(delay / 60))))
+        try:
+            time.sleep(delay)
+        except KeyboardInterrupt:
+            return 0
+
+
+def parse_byte_range(header: Optional[str], size: int) -> Optional[tuple[int, int]]:
+    match = re.fullmatch(r"bytes=(\d*)-(\d*)", (header or "").strip())
+    if not match or not any(match.groups()):
+        raise ValueError(header)
+    first, last = match.groups()
+    if not first:
+        start, end = max(0, size - int(last)), size - 1
+    else:
+        start, end = int(first), min(size - 1, int(last)) if last else size - 1
+    if start >= size or start > end:
+        return None
+    return start, end
+
+
+def mirror_handler(base_dir: Path, logger: Logger):
+    archives_dir = base_dir / DOWNLOADS_SUBDIR / ARCHIVES_SUBDIR
+    cache_path = base_dir / METADATA_CACHE_NAME
+    latest_path = release_api_path(None)
+    tags_prefix = release_api_path("")
+
+    class MirrorHandler(http.server.BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        server_version = USER_AGENT + "-Mirror"
+
+        def log_message(self, format: str, *args) -> None:
+            logger.log(f"{self.address_string()} {format % args}")
+
+        def do_HEAD(self) -> None:
+            self.do_GET(head=True)
+
+        def do_GET(self, head: bool = False) -> None:
+            path = unquote(urlsplit(self.path).path)
+            if path == latest_path or path.startswith(tags_prefix):
+                self.send_metadata(API_BASE + path, head)
+            elif path.startswith(f"/{ARCHIVES_SUBDIR}/"):
+                self.send_archive(path[len(ARCHIVES_SUBDIR) + 2 :], head)
+            else:
+                self.send_empty(404)
+
+        def send_empty(self, status: int, headers: Optional[dict] = None) -> None:
+            self.send_response(status)
+            for key, value in (headers or {}).items():
+                self.send_header(key, value)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+        def send_metadata(self, url: str, head: bool) -> None:
+            entry = load_metadata_cache(cache_path)["entries"].get(url)
+            if not entry:
+                self.send_empty(404)
+                return
+            etag = entry.get("etag")
+            if etag and self.headers.get("If-None-Match") == etag:
+                self.send_empty(304, {"ETag": etag})
+                return
+            body = json.dumps(entry["body"]).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            if etag:
+                self.send_header("ETag", etag)
+            if "gzip" in self.headers.get("Accept-Encoding", ""):
+                body = gzip.compress(body)
+                self.send_header("Content-Encoding", "gzip")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            if not head:
+                self.wfile.write(body)
+
+        def send_archive(self, name: str, head: bool) -> None:
+            archive_path = archives_dir / name
+            if not MIRROR_ARCHIVE_RE.fullmatch(name) or not digest_path(archive_path).is_file():
+                self.send_empty(404)
+                return
+            try:
+                source = open(archive_path, "rb")
+            except OSError:
+                self.send_empty(404)
+                return
+            with source:
+                size = os.fstat(source.fileno()).st_size
+                etag = f'"{archive_path.stem}"'
+                start, end = 0, size - 1
+                status = 200
+                range_header = self.headers.get("Range")
+                if range_header and self.headers.get("If-Range", etag) == etag:
+                    try:
+                        byte_range = parse_byte_range(range_header, size)
+                    except ValueError:
+                        byte_range = (start, end)
+                    if byte_range is None:
+                        self.send_empty(416, {"Content-Range": f"bytes */{size}"})
+                        return
+                    if byte_range != (0, size - 1):
+                        start, end = byte_range
+                        status = 206
+                self.send_response(status)
+                self.send_header("Content-Type", "application/zip")
+                self.send_header("Accept-Ranges", "bytes")
+                self.send_header("ETag", etag)
+                if status == 206:
+                    self.send_header("Content-Range", f"bytes {start}-{end}/{size}")
+                self.send_header("Content-Length", str(end - start + 1))
+                self.end_headers()
+                if head:
+                    return
+                self.wfile.flush()
+                self.connection.sendfile(source, start, end - start + 1)
+
+    return MirrorHandler
+
+
+def serve_mirror(base_dir: Path, address: str, logger: Logger, strings: dict) -> int:
+    host, _, port = address.rpartition(":")
+    server = http.server.ThreadingHTTPServer((host or "0.0.0.0", int(port)), mirror_handler(base_dir, logger))
+    server.daemon_threads = True
+    logger.log(strings["mirror_serving"].format(url=f"http://{host or '0.0.0.0'}:{server.server_port}"))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        logger.close()
+    return 0
+
+
+def write_profile(profiler, path: Path) -> None:
+    import pstats
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    profiler.dump_stats(str(path))
+    stats = pstats.Stats(profiler, stream=sys.stderr)
+    stats.sort_stats("cumulative").print_stats(25)
+    print(f"Profile written to {path}", file=sys.stderr)
+
+
+def run(args: argparse.Namespace, base_dir: Path, tracer: Tracer) -> int:
     log_path = base_dir / LOG_NAME
     config_path = base_dir / CONFIG_NAME
     config = load_config(config_path)
-    install_dir = Path(args.install_dir or DEFAULT_INSTALL)
+    try:
+        install_dirs = resolve_install_dirs(args)
+    except (OSError, ValueError) as exc:
+        print(f"Cannot read install manifest: {exc}", file=sys.stderr)
+        return 1
+    targets_text = ", ".join(str(target) for target in install_dirs)
+
+    if args.apply_install:
+        strings = ensure_language(STRINGS, args.language or DEFAULT_LANG)
+        reports = install_targets_local(
+            Path(args.apply_install),
+            install_dirs,
+            Logger(None),
+            strings,
+            args.install_mode,
+            args.tag,
+            args.copy_method,
+            args.install_workers,
+            tracer,
+        )
+        if args.apply_report:
+            Path(args.apply_report).write_text(json.dumps(reports), encoding="utf-8")
+        for report in reports:
+            if not report["ok"]:
+                print(report["error"], file=sys.stderr)
+        return 0 if all(report["ok"] for report in reports) else 1
+
+    if args.apply_rollback:
+        strings = ensure_language(STRINGS, args.language or DEFAULT_LANG)
+        reports = rollback_targets(Path(args.apply_rollback), install_dirs, Logger(None), strings, args.copy_method)
+        if args.apply_report:
+            Path(args.apply_report).write_text(json.dumps(reports), encoding="utf-8")
+        return 0 if all(report["ok"] for report in reports) else 1
+
+    if args.serve or args.prefetch or args.daemon or args.gc or args.rollback:
+        lang_code = args.language or config.get("language")
+        strings = ensure_language(STRINGS, lang_code if lang_code in ALLOWED_LANG_CODES else DEFAULT_LANG)
+        logger = Logger(log_path, log_format=args.log_format, max_bytes=args.log_max_bytes)
+        if args.rollback:
+            started = time.perf_counter()
+            try:
+                with tracer.span("rollback"):
+                    reports = rollback_bundle(base_dir / SNAPSHOTS_SUBDIR, install_dirs, logger, strings, args.copy_method)
+            finally:
+                logger.close()
+            if args.emit_json:
+                failed = [report for report in reports if not report["ok"]]
+                if len(failed) == 1 and len(reports) == 1:
+                    message = failed[0]["error"]
+                elif failed:
+                    message = f"Rollback failed for {len(failed)} of {len(reports)} targets"
+                else:
+                    message = "; ".join(
+                        strings["rollback_done"].format(path=report["target"], version=report["version"])
+                        for report in reports
+                    )
+                elapsed = round(time.perf_counter() - started, 6)
+                emit_json("Failed" if failed else "Finished", message, elapsed, targets=reports)
+            return 0 if all(report["ok"] for report in reports) else 1
+        if args.gc:
+            store = BundleStore(
+                base_dir / DOWNLOADS_SUBDIR,
+                CopyEngine(args.copy_method),
+                args.store_max_bytes,
+                args.store_keep,
+                args.archive_keep,
+            )
+            try:
+                with tracer.span("store_gc"):
+                    summary = store.gc()
+                log_store_summary(summary, logger, strings)
+                if args.emit_json:
+                    emit_json("Finished", "gc", 0.0, store=summary)
+                return 0
+            except OSError as exc:
+                logger.log(f"ERROR: {exc}")
+                return 1
+            finally:
+                logger.close()
+        if not args.serve:
+            try:
+                return run_prefetch(args, base_dir, logger, strings, tracer)
+            finally:
+                logger.close()
+        try:
+            return serve_mirror(base_dir, args.serve, logger, strings)
+        except (OSError, ValueError) as exc:
+            print(f"Cannot serve release mirror on {args.serve}: {exc}", file=sys.stderr)
+            return 1
 
     interactive_mode = sys.stdin.isatty() and not args.yes and not args.emit_json
     download_only_mode = args.download_only
@@ -1007,13 +3753,13 @@ def main() -> int:
             yes_label, no_label = YES_NO_LABELS.get(lang_code, ("Yes", "No"))
             hint_text = YES_NO_HINTS.get(lang_code, YES_NO_HINTS.get(DEFAULT_LANG))
             proceed = session.prompt_yes_no(
-                strings["prompt_continue"].format(path=install_dir),
+                strings["prompt_continue"].format(path=targets_text),
                 default_yes=True,
                 hint=hint_text,
                 yes_label=yes_label,
                 no_label=no_label,
             )
-            logger = Logger(log_path, display=session)
+            logger = Logger(log_path, display=session, log_format=args.log_format, max_bytes=args.log_max_bytes)
             session.reset_log()
 
             if not proceed:
@@ -1027,7 +3773,7 @@ def main() -> int:
             exit_code = execute_update(
                 args,
                 strings,
-                install_dir,
+                install_dirs,
                 download_only_mode,
                 logger,
                 base_dir,
@@ -1035,6 +3781,7 @@ def main() -> int:
                 hold_callback=session.wait_for_exit,
                 allow_manual_choice=False,
                 display=session,
+                tracer=tracer,
             )
             result["code"] = exit_code
 
@@ -1051,12 +3798,12 @@ def main() -> int:
     config["language"] = lang_code
     save_config(config_path, config)
 
-    logger = Logger(log_path)
+    logger = Logger(log_path, log_format=args.log_format, max_bytes=args.log_max_bytes)
 
     hold_window = args.hold_window
 
     if not args.yes:
-        answer = input(strings["prompt_continue"].format(path=install_dir)).strip().lower()
+        answer = input(strings["prompt_continue"].format(path=targets_text)).strip().lower()
         if answer in {"n", "no"}:
             logger.log(strings["cancelled"])
             if args.emit_json:
@@ -1070,12 +3817,115 @@ def main() -> int:
     return execute_update(
         args,
         strings,
-        install_dir,
+        install_dirs,
         download_only_mode,
         logger,
         base_dir,
         hold_window,
+        tracer=tracer,
     )
 
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="LaunchNext updater")
+    parser.add_argument("--tag")
+    parser.add_argument(
+        "--channel",
+        choices=RELEASE_CHANNELS,
+        default="stable",
+        help="Release channel; beta also considers prereleases",
+    )
+    parser.add_argument(
+        "--version-range",
+        type=version_range,
+        metavar="SPEC",
+        help="Pick the newest release matching e.g. '2.x' or '>=1.4,<2'",
+    )
+    parser.add_argument("--asset-pattern", default=DEFAULT_PATTERN)
+    parser.add_argument("--install-dir", action="append", help="Install target; repeat to update several copies")
+    parser.add_argument("--install-manifest", help="File listing install targets, one per line or as a JSON list")
+    parser.add_argument("--install-workers", type=int, default=4, help="Concurrent installs when updating several targets")
+    parser.add_argument("--install-mode", choices=["delta", "full"], default="delta")
+    parser.add_argument("--copy-method", choices=["auto", *CopyEngine.METHODS], default="auto")
+    parser.add_argument("--apply-install", help=argparse.SUPPRESS)
+    parser.add_argument("--apply-report", help=argparse.SUPPRESS)
+    parser.add_argument("--apply-rollback", help=argparse.SUPPRESS)
+    parser.add_argument("--rollback", action="store_true", help="Restore the version installed before the last update")
+    parser.add_argument(
+        "--snapshot-keep",
+        type=int,
+        default=SNAPSHOT_KEEP,
+        help="Rollback snapshots to keep per install target (0 disables them)",
+    )
+    parser.add_argument("--download-only", action="store_true")
+    parser.add_argument("--connections", type=int, default=1, help="Parallel connections for the asset download")
+    parser.add_argument(
+        "--mirror",
+        default=os.environ.get("LAUNCHNEXT_MIRROR"),
+        metavar="URL",
+        help="LAN mirror to fetch verified release archives from before GitHub",
+    )
+    parser.add_argument(
+        "--serve",
+        nargs="?",
+        const=MIRROR_ADDRESS,
+        metavar="HOST:PORT",
+        help="Serve cached release metadata and archives to other machines",
+    )
+    parser.add_argument("--gc", action="store_true", help="Evict old download-only bundles, cached archives and unused store objects")
+    parser.add_argument(
+        "--store-max-bytes",
+        type=int,
+        default=STORE_MAX_BYTES,
+        help="Size cap for store objects and cached archives together",
+    )
+    parser.add_argument("--store-keep", type=int, default=STORE_KEEP, help="Download-only bundles to keep")
+    parser.add_argument(
+        "--archive-keep",
+        type=int,
+        default=ARCHIVE_KEEP,
+        help="Downloaded release archives to keep, including the current one",
+    )
+    parser.add_argument("--prefetch", action="store_true", help="Download and stage the latest release, then exit")
+    parser.add_argument("--daemon", action="store_true", help="Keep prefetching new releases in the background")
+    parser.add_argument(
+        "--poll-interval",
+        type=float,
+        default=PREFETCH_INTERVAL_SECONDS,
+        metavar="SECONDS",
+        help="Seconds between release checks in --daemon mode",
+    )
+    parser.add_argument("--sha256", help="Expected SHA-256 of the release asset")
+    parser.add_argument("--emit-json", action="store_true")
+    parser.add_argument("--yes", action="store_true", help="Run without prompts")
+    parser.add_argument("--language", choices=list(STRINGS.keys()))
+    parser.add_argument("--reset-language", action="store_true")
+    parser.add_argument("--hold-window", action="store_true")
+    parser.add_argument("--log-format", choices=["text", "json"], default="text")
+    parser.add_argument("--log-max-bytes", type=int, default=LOG_MAX_BYTES, help="Rotate updater.log beyond this size")
+    parser.add_argument("--trace", metavar="FILE", help="Write a Chrome trace-event JSON of the update stages")
+    parser.add_argument("--profile", nargs="?", const="", metavar="FILE", help="Profile the run with cProfile")
+    args = parser.parse_args()
+    load_lazy_modules()
+
+    base_dir = Path.home() / "Library" / "Application Support" / "LaunchNext" / "updates"
+    tracer = Tracer()
+    profiler = None
+    if args.profile is not None:
+        import cProfile
+
+        profiler = cProfile.Profile()
+        profiler.enable()
+    try:
+        with tracer.span("run"):
+            return run(args, base_dir, tracer)
+    finally:
+        if profiler is not None:
+            profiler.disable()
+            write_profile(profiler, Path(args.profile) if args.profile else base_dir / PROFILE_NAME)
+        if args.trace:
+            tracer.write(Path(args.trace))
+
+
 if __name__ == "__main__":
     sys.exit(main())